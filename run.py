@@ -7,6 +7,10 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.append(str(project_root))
 
+# Configure the environment before any heavy imports
+from src import configure_performance_environment
+configure_performance_environment()
+
 # Import and run the Streamlit app
 from src.ui.main import main
 
@@ -1,9 +1,13 @@
 import os
 from pathlib import Path
-from dotenv import load_dotenv
 from datetime import datetime
 import logging
 import asyncio
+from src import configure_performance_environment
+
+# Configure the environment before ChromaDB and friends are imported
+configure_performance_environment()
+
 from src.data_ingestion import DataIngestion
 from src.data_ingestion.content_analyzer import ContentAnalyzer
 from src.storage import StorageManager
@@ -33,7 +37,9 @@ def create_directories():
         './logs'
     ]
     for directory in directories:
-        Path(directory).mkdir(parents=True, exist_ok=True)
+        # A single stat for directories that already exist
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
 
 async def process_repository_content(content_analyzer: ContentAnalyzer, results: Dict[str, Any]) -> Dict[str, Any]:
     """Process repository content and generate enhanced data."""
@@ -84,12 +90,19 @@ async def store_all_data(
         logger.error(f"Error storing data: {e}")
         raise
 
-async def process_text_content(local_path: str, persist_directory: str) -> bool:
+async def process_text_content(
+    local_path: str,
+    persist_directory: str,
+    batch_size: int = 200
+) -> bool:
     """Process text and markdown files separately."""
     try:
         logger.info("Processing text and markdown files...")
-        text_processor = TextProcessor(local_path, persist_directory)
-        results = text_processor.process_text_files()
+        # Text processing is blocking file and ChromaDB I/O, so keep it off the event loop
+        text_processor = await asyncio.to_thread(
+            TextProcessor, local_path, persist_directory, batch_size
+        )
+        results = await asyncio.to_thread(text_processor.process_text_files)
         
         logger.info(f"Processed {results['processed_files']} text files")
         if results['failed_files'] > 0:
@@ -105,7 +118,6 @@ async def process_text_content(local_path: str, persist_directory: str) -> bool:
 
 async def main():
     # Setup
-    load_dotenv()
     create_directories()
     
     try:
@@ -113,7 +125,12 @@ async def main():
         storage = StorageManager(
             persist_directory='./data/embeddings',
             metadata_db_path='./data/metadata.db',
-            preserve_data=True
+            preserve_data=True,
+            hnsw_config={
+                'construction_ef': 200,
+                'search_ef': 100,
+                'M': 16
+            }
         )
         
         ingestion = DataIngestion(
@@ -125,27 +142,33 @@ async def main():
         
         # Step 1: Initialize Repository
         logger.info("Initializing repository...")
-        if not ingestion.initialize_repo():
+        if not await asyncio.to_thread(ingestion.initialize_repo):
             raise Exception("Failed to initialize repository")
         
-        # Step 2: Process Repository
-        logger.info("Processing repository content...")
-        results = ingestion.process_repository()
-        
-        # Step 3: Generate Enhanced Content
-        logger.info("Analyzing repository content...")
-        processed_content = await process_repository_content(content_analyzer, results)
-        
-        # Step 4: Store All Data
-        logger.info("Storing processed data...")
-        await store_all_data(storage, results, processed_content)
-        
-        # Step 5: Process Text and Markdown Files
+        # Step 2: Process Text and Markdown Files
+        # Only depends on the cloned repository, so run it alongside the remaining steps
         logger.info("Starting text and markdown file processing...")
-        text_processing_result = await process_text_content(
+        text_task = asyncio.create_task(process_text_content(
             local_path=str(Path("./data/raw/whisper")),
             persist_directory='./data/embeddings'
-        )
+        ))
+        
+        try:
+            # Step 3: Process Repository
+            logger.info("Processing repository content...")
+            results = await asyncio.to_thread(ingestion.process_repository)
+            
+            # Step 4: Generate Enhanced Content
+            logger.info("Analyzing repository content...")
+            processed_content = await process_repository_content(content_analyzer, results)
+            
+            # Step 5: Store All Data
+            logger.info("Storing processed data...")
+            await store_all_data(storage, results, processed_content)
+        finally:
+            # Let text processing finish even if a later step failed;
+            # process_text_content reports its own errors
+            text_processing_result = await text_task
         
         if text_processing_result:
             logger.info("Text and markdown processing completed successfully")
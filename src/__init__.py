@@ -0,0 +1,27 @@
+# src/__init__.py
+import os
+from dotenv import load_dotenv
+
+_environment_configured = False
+
+
+def configure_performance_environment() -> None:
+    """Load environment variables and apply thread settings once per process.
+
+    Must run before numeric libraries (ChromaDB, NumPy, tokenizers) are
+    imported for the thread settings to take effect. Values already set in
+    the environment are left untouched.
+    """
+    global _environment_configured
+    if _environment_configured:
+        return
+
+    load_dotenv()
+
+    threads = str(max(1, (os.cpu_count() or 2) // 2))
+    os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+    os.environ.setdefault('OMP_NUM_THREADS', threads)
+    os.environ.setdefault('MKL_NUM_THREADS', threads)
+    os.environ.setdefault('OPENBLAS_NUM_THREADS', threads)
+
+    _environment_configured = True
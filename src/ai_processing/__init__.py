@@ -1,8 +1,11 @@
 # src/ai_processing/__init__.py
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
+import asyncio
 import logging
 import json
+from functools import lru_cache
+from types import MappingProxyType
 from .query_processor import QueryProcessor
 from .context_retriever import ContextRetriever
 from .llm_interface import LLMInterface
@@ -23,46 +26,40 @@ class AIProcessor:
         self.response_generator = ResponseGenerator()
         
         self.storage = storage_manager
+        self._cache = getattr(storage_manager, 'cache', None)
+        self._text_handler = None
         
-        # Setup enhanced logging
-        self.logger.setLevel(logging.DEBUG)
-        handler = logging.StreamHandler()
-        handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s'
-        ))
-        self.logger.addHandler(handler)
+        # Query intent is a pure function of the query string, so memoize it
+        self._query_intent_cached = lru_cache(maxsize=1024)(self._freeze_query_intent)
+        
+        # Warm embedding and text search resources before serving the first query
+        try:
+            self.context_retriever.preload_model()
+            self._get_text_handler()
+        except Exception as e:
+            self.logger.warning(f"Error preloading models: {e}")
+        
+        # Setup enhanced logging (level is inherited from the root logger).
+        # The logger is module-level, so only attach the handler once.
+        if not any(isinstance(h, logging.StreamHandler) for h in self.logger.handlers):
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter(
+                '%(asctime)s - %(levelname)s - %(message)s'
+            ))
+            self.logger.addHandler(handler)
 
     # src/ai_processing/__init__.py
 
-    async def process_query(self, query: str) -> Dict[str, Any]:
-        """Process a user query and generate a response."""
-        try:
-            self.logger.info(f"Processing query: {query}")
-            
-            # Check cache only if available
-            if hasattr(self.storage, 'cache') and self.storage.cache:
-                cached_response = self.storage.cache.get_response(query)
-                if cached_response:
-                    return cached_response
-
-            # Process the query
-            processed_query = self.query_processor.process_query(query)
-            self.logger.info(f"Processed query: {processed_query}")
-            
-            # Retrieve relevant context
-            context = self.context_retriever.get_context(processed_query)
+    async def process_query(self, query: str, debug: bool = False) -> Dict[str, Any]:
+        """Process a user query and generate a response.
 
-            # If regular processing didn't find relevant context, try text content
-            if not context or not any(context.values()):
-                self.logger.info("No context found in primary search, trying text content...")
-                text_handler = TextSearchHandler('./data/embeddings')
-                text_response = await text_handler.handle_text_query(query, self.llm_interface)
-                if text_response:
-                    self.logger.info("Found relevant text content")
-                    return text_response
-            
-            # Log context information
-            self._log_context_info(context)
+        Debug information about query classification and retrieved context
+        is only attached to the response when ``debug`` is True.
+        """
+        try:
+            early_response, processed_query, context = await self._prepare_query(query)
+            if early_response is not None:
+                return early_response
             
             # Generate LLM response
             llm_response = await self.llm_interface.generate_response(
@@ -71,14 +68,102 @@ class AIProcessor:
                 processed_query
             )
             
-            # Generate final response
-            response = self.response_generator.generate_response(
-                llm_response,
-                processed_query,
-                context
-            )
+            return await self._finalize_response(query, llm_response, processed_query, context, debug)
             
-            # Add debug information
+        except Exception as e:
+            self.logger.error(f"Error processing query: {e}")
+            return self._create_error_response(query, str(e))
+
+    async def process_query_stream(self, query: str, debug: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Process a user query, streaming the answer as it is generated.
+
+        Yields ``{'delta': str, 'done': False}`` items as LLM tokens arrive,
+        then the complete response (as returned by ``process_query``) with
+        ``'done': True``. Cached and text-content responses are yielded whole.
+        """
+        try:
+            early_response, processed_query, context = await self._prepare_query(query)
+            if early_response is not None:
+                yield {**early_response, 'done': True}
+                return
+            
+            # Stream LLM response
+            llm_response = None
+            async for event in self.llm_interface.generate_response_stream(
+                query,
+                context,
+                processed_query
+            ):
+                if event['type'] == 'delta':
+                    yield {'delta': event['content'], 'done': False}
+                else:
+                    llm_response = event['response']
+            
+            response = await self._finalize_response(query, llm_response, processed_query, context, debug)
+            yield {**response, 'done': True}
+            
+        except Exception as e:
+            self.logger.error(f"Error processing query: {e}")
+            yield {**self._create_error_response(query, str(e)), 'done': True}
+
+    async def _prepare_query(
+        self,
+        query: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Run the steps shared by ``process_query`` and ``process_query_stream`` before the LLM call.
+
+        Returns ``(response, None, None)`` when a cached or text-content
+        response already answers the query, otherwise
+        ``(None, processed_query, context)``.
+        """
+        self.logger.info("Processing query: %s", query)
+        
+        # Check cache only if available
+        if self._cache is not None:
+            cached_response = await asyncio.to_thread(
+                self._cache.get_response, query
+            )
+            if cached_response:
+                return cached_response, None, None
+
+        # Process the query
+        processed_query = self.query_processor.process_query(query)
+        self.logger.info("Processed query: %s", processed_query)
+        
+        # Retrieve relevant context
+        context = self.context_retriever.get_context(processed_query)
+
+        # If regular processing didn't find relevant context, try text content
+        if not context or not any(context.values()):
+            self.logger.info("No context found in primary search, trying text content...")
+            text_handler = self._get_text_handler()
+            text_response = await text_handler.handle_text_query(query, self.llm_interface)
+            if text_response:
+                self.logger.info("Found relevant text content")
+                return text_response, None, None
+        
+        # Log context information
+        self._log_context_info(context)
+        
+        return None, processed_query, context
+
+    async def _finalize_response(
+        self,
+        query: str,
+        llm_response: Dict[str, Any],
+        processed_query: Dict[str, Any],
+        context: Dict[str, Any],
+        debug: bool
+    ) -> Dict[str, Any]:
+        """Build the final response from the LLM output and cache it."""
+        response = self.response_generator.generate_response(
+            llm_response,
+            processed_query,
+            context
+        )
+        
+        # Add debug information only when requested
+        if debug:
             response['debug_info'] = {
                 'query_type': processed_query['query_type'],
                 'context_types': list(context.keys()),
@@ -87,54 +172,67 @@ class AIProcessor:
                     for k, v in context.items()
                 }
             }
-            
-            # Cache response only if cache is available
-            if hasattr(self.storage, 'cache') and self.storage.cache:
-                self.storage.cache.store_response(query, response)
-            
-            return response
-            
-        except Exception as e:
-            self.logger.error(f"Error processing query: {e}")
-            return self._create_error_response(query, str(e))
+        
+        # Cache response only if cache is available; debug info is per-execution
+        if self._cache is not None:
+            cache_payload = {k: v for k, v in response.items() if k != 'debug_info'}
+            await asyncio.to_thread(
+                self._cache.store_response, query, cache_payload
+            )
+        
+        return response
+
+    def _freeze_query_intent(self, query: str) -> MappingProxyType:
+        """Analyze query intent into a read-only mapping suitable for caching."""
+        return MappingProxyType(self.query_processor.analyze_query_intent(query))
+
+    def _get_text_handler(self) -> TextSearchHandler:
+        """Lazily create and reuse the text content search handler."""
+        if self._text_handler is None:
+            self._text_handler = TextSearchHandler('./data/embeddings')
+        return self._text_handler
 
     def _log_context_info(self, context: Dict[str, Any]) -> None:
         """Log detailed information about retrieved context."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info("\nContext Information:")
         for context_type, items in context.items():
             if isinstance(items, list):
-                self.logger.info(f"\n{context_type.upper()} - {len(items)} items found")
+                self.logger.info("\n%s - %d items found", context_type.upper(), len(items))
                 for idx, item in enumerate(items[:2]):  # Log first 2 items of each type
-                    self.logger.info(f"\nItem {idx + 1}:")
+                    self.logger.info("\nItem %d:", idx + 1)
                     if isinstance(item, dict):
-                        self.logger.info(f"Content preview: {str(item.get('content', ''))[:200]}...")
-                        self.logger.info(f"Source: {item.get('metadata', {}).get('file_path', 'unknown')}")
+                        self.logger.info("Content preview: %s...", str(item.get('content', ''))[:200])
+                        self.logger.info("Source: %s", item.get('metadata', {}).get('file_path', 'unknown'))
 
     def _verify_context_quality(self, context: Dict[str, Any]) -> bool:
         """Verify that we have sufficient quality context to answer the query."""
         if not context:
             return False
             
-        # Check for content in lists
-        content_items = [
-            item for items in context.values()
-            if isinstance(items, list)
-            for item in items
-            if isinstance(item, dict) and item.get('content')
-        ]
-        
-        if not content_items:
-            return False
-            
-        # Check total content length
-        total_content = sum(len(str(item.get('content', ''))) for item in content_items)
         min_content_length = 100  # Minimum characters of context needed
-        
-        if total_content < min_content_length:
+
+        # Accumulate content length in a single pass, stopping once the threshold is met
+        has_content = False
+        total_content = 0
+        for items in context.values():
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                content = item.get('content')
+                if not content:
+                    continue
+                has_content = True
+                total_content += len(content) if isinstance(content, str) else len(str(content))
+                if total_content >= min_content_length:
+                    return True
+
+        if has_content:
             self.logger.warning(f"Insufficient content length: {total_content} chars")
-            return False
-            
-        return True
+        return False
 
     def _create_insufficient_context_response(self, query: str) -> Dict[str, Any]:
         """Create a more informative response for insufficient context."""
@@ -167,17 +265,32 @@ class AIProcessor:
             }
         }
 
-    async def batch_process_queries(self, queries: List[str]) -> List[Dict[str, Any]]:
-        """Process multiple queries in batch."""
-        responses = []
-        for query in queries:
-            response = await self.process_query(query)
-            responses.append(response)
-        return responses
+    async def batch_process_queries(
+        self,
+        queries: List[str],
+        max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """Process multiple queries concurrently, preserving input order."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _run(query: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.process_query(query)
+
+        results = await asyncio.gather(
+            *[_run(query) for query in queries],
+            return_exceptions=True
+        )
+
+        return [
+            self._create_error_response(query, str(result))
+            if isinstance(result, BaseException) else result
+            for query, result in zip(queries, results)
+        ]
 
     def analyze_query_patterns(self, query: str) -> Dict[str, bool]:
         """Analyze query patterns for better response generation."""
-        return self.query_processor.analyze_query_intent(query)
+        return dict(self._query_intent_cached(query))
 
     def get_suggested_queries(self, query: str) -> List[str]:
         """Get suggested follow-up queries."""
@@ -190,46 +303,56 @@ class AIProcessor:
     # Add this method to your src/ai_processing/__init__.py in the AIProcessor class
 
     async def debug_process_query(self, query: str) -> Dict[str, Any]:
-        """Debug version of process_query with detailed logging."""
+        """Debug version of process_query with detailed logging.
+
+        Falls back to ``process_query`` when Python runs with ``-O``.
+        """
+        if not __debug__:
+            return await self.process_query(query, debug=True)
+
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
         try:
-            print("\n=== Starting Debug Query Processing ===")
-            print(f"\nProcessing query: {query}")
+            self.logger.debug("=== Starting Debug Query Processing ===")
+            self.logger.debug("Processing query: %s", query)
             
             # Check cache
-            cached_response = self.storage.cache.get_response(query)
-            if cached_response:
-                print("\nFound cached response")
-                return cached_response
+            if self._cache is not None:
+                cached_response = self._cache.get_response(query)
+                if cached_response:
+                    self.logger.debug("Found cached response")
+                    return cached_response
 
             # Process query
             processed_query = self.query_processor.process_query(query)
-            print(f"\nProcessed query type: {processed_query['query_type']}")
-            print(f"Processed query entities: {processed_query.get('entities', {})}")
+            self.logger.debug("Processed query type: %s", processed_query['query_type'])
+            self.logger.debug("Processed query entities: %s", processed_query.get('entities', {}))
             
             # Get context
-            print("\nRetrieving context...")
+            self.logger.debug("Retrieving context...")
             context = self.context_retriever.get_context(processed_query)
             
-            # Print context summary
-            print("\nContext Summary:")
-            for context_type, items in context.items():
-                if isinstance(items, list):
-                    print(f"\n{context_type}: {len(items)} items")
-                    for idx, item in enumerate(items[:2]):  # Show first 2 items
-                        if isinstance(item, dict):
-                            print(f"\nItem {idx + 1} preview:")
-                            print(f"Content: {str(item.get('content', ''))[:200]}...")
-                            print(f"Source: {item.get('metadata', {}).get('file_path', 'unknown')}")
+            # Log context summary
+            if debug_enabled:
+                self.logger.debug("Context Summary:")
+                for context_type, items in context.items():
+                    if isinstance(items, list):
+                        self.logger.debug("%s: %d items", context_type, len(items))
+                        for idx, item in enumerate(items[:2]):  # Show first 2 items
+                            if isinstance(item, dict):
+                                self.logger.debug("Item %d preview:", idx + 1)
+                                self.logger.debug("Content: %s...", str(item.get('content', ''))[:200])
+                                self.logger.debug("Source: %s", item.get('metadata', {}).get('file_path', 'unknown'))
             
             # Generate response
-            print("\nGenerating LLM response...")
+            self.logger.debug("Generating LLM response...")
             llm_response = await self.llm_interface.generate_response(
                 query,
                 context,
                 processed_query
             )
             
-            print(f"\nLLM Response preview: {llm_response.get('answer', '')[:200]}...")
+            if debug_enabled:
+                self.logger.debug("LLM Response preview: %s...", llm_response.get('answer', '')[:200])
             
             # Generate final response
             response = self.response_generator.generate_response(
@@ -238,9 +361,9 @@ class AIProcessor:
                 context
             )
             
-            print("\n=== Debug Processing Complete ===")
+            self.logger.debug("=== Debug Processing Complete ===")
             return response
             
         except Exception as e:
-            print(f"\nError in debug processing: {e}")
-            raise
\ No newline at end of file
+            self.logger.debug("Error in debug processing: %s", e)
+            raise
@@ -0,0 +1,118 @@
+# src/ai_processing/_scoring.py
+"""Numeric kernels for relevance scoring, JIT-compiled with Numba when installed."""
+
+from typing import Iterable, List, Tuple
+import numpy as np
+
+try:
+    import numba
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    _NUMBA_AVAILABLE = False
+
+# Below this many candidates the Python set-based path is faster than the kernel call
+NUMBA_MIN_BATCH = 64
+
+# Below this many distances NumPy's array ops are faster than the kernel call
+FILTER_MIN_BATCH = 32
+
+_FNV_OFFSET = 0xcbf29ce484222325
+_FNV_PRIME = 0x100000001b3
+_MASK_64 = 0xffffffffffffffff
+
+
+def _hash_token(token: bytes) -> int:
+    """64-bit FNV-1a hash of a token, matching the one computed in the kernel."""
+    h = _FNV_OFFSET
+    for byte in token:
+        h = ((h ^ byte) * _FNV_PRIME) & _MASK_64
+    return h
+
+
+def hash_query_words(words: Iterable[str]) -> np.ndarray:
+    """Sorted array of token hashes for a set of query words."""
+    return np.unique(np.array(
+        [_hash_token(word.encode('utf-8')) for word in words], dtype=np.uint64
+    ))
+
+
+if _NUMBA_AVAILABLE:
+    @numba.njit(cache=True, parallel=True)
+    def _overlap_kernel(offsets, data, query_hashes):
+        count = offsets.shape[0] - 1
+        common = np.zeros(count, dtype=np.float64)
+        sizes = np.zeros(count, dtype=np.float64)
+        for i in numba.prange(count):
+            start = offsets[i]
+            end = offsets[i + 1]
+            hashes = np.empty((end - start) // 2 + 1, dtype=np.uint64)
+            n = 0
+            h = np.uint64(_FNV_OFFSET)
+            in_token = False
+            for pos in range(start, end + 1):
+                # Words are runs of [a-z0-9_], as in the Python tokenizer
+                byte = data[pos] if pos < end else 32
+                if not ((97 <= byte <= 122) or (48 <= byte <= 57) or byte == 95):
+                    if in_token:
+                        hashes[n] = h
+                        n += 1
+                        h = np.uint64(_FNV_OFFSET)
+                        in_token = False
+                else:
+                    h = (h ^ np.uint64(byte)) * np.uint64(_FNV_PRIME)
+                    in_token = True
+            if n == 0:
+                continue
+            tokens = np.sort(hashes[:n])
+            unique = 0
+            hits = 0
+            for j in range(n):
+                if j == 0 or tokens[j] != tokens[j - 1]:
+                    unique += 1
+                    k = np.searchsorted(query_hashes, tokens[j])
+                    if k < query_hashes.shape[0] and query_hashes[k] == tokens[j]:
+                        hits += 1
+            common[i] = hits
+            sizes[i] = unique
+        return common, sizes
+
+    @numba.njit(cache=True)
+    def _filter_scores_kernel(distances, threshold):
+        # Sequential so kept indices can be compacted in order without a race
+        n = distances.shape[0]
+        scores = np.empty(n, dtype=np.float64)
+        keep = np.empty(n, dtype=np.int64)
+        k = 0
+        for i in range(n):
+            score = 1.0 - min(distances[i], 1.0)
+            scores[i] = score
+            if score > threshold:
+                keep[k] = i
+                k += 1
+        return keep[:k], scores
+
+
+def token_overlap(lowered: List[str], query_hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Count query-word overlap and distinct words for each of many ASCII contents.
+
+    Returns ``(common, sizes)``, equivalent to ``len(query_words & words)`` and
+    ``len(words)`` with ``words`` the set of ``[a-z0-9_]+`` runs in the content.
+    """
+    encoded = [content.encode('ascii') for content in lowered]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(content) for content in encoded], out=offsets[1:])
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return _overlap_kernel(offsets, data, query_hashes)
+
+
+def filter_scores(distances: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert distances to ``1 - min(d, 1)`` relevance scores and find those above ``threshold``.
+
+    Returns ``(keep, scores)`` with ``keep`` the ascending indices of kept scores.
+    """
+    distances = np.ascontiguousarray(distances, dtype=np.float64)
+    if _NUMBA_AVAILABLE and distances.shape[0] >= FILTER_MIN_BATCH:
+        return _filter_scores_kernel(distances, threshold)
+    scores = 1.0 - np.minimum(distances, 1.0)
+    return np.flatnonzero(scores > threshold), scores
@@ -1,10 +1,154 @@
 # src/ai_processing/context_retriever.py
 # src/ai_processing/context_retriever.py
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
 import logging
-from difflib import SequenceMatcher
+import os
+import re
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import heapq
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
 import json
 from datetime import datetime
+import numpy as np
+import orjson
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    from rapidfuzz import fuzz, process as fuzz_process
+except ImportError:
+    fuzz = None
+    fuzz_process = None
+
+from ._scoring import _NUMBA_AVAILABLE, NUMBA_MIN_BATCH, hash_query_words, token_overlap
+
+# Terms indicating that repository-level information is relevant to a query
+_REPO_INFO_RE = re.compile(
+    r'setup|install|requirement|dependency|package|version|configuration|repository|structure'
+)
+
+# Word tokens for relevance scoring; punctuation and whitespace separate words
+_TOK_RE = re.compile(r'[a-z0-9_]+')
+
+# Queries with at most this many words match words by substring search
+_SHORT_QUERY_WORDS = 8
+
+# Long contents are scored on a window of this many characters around the first query word hit
+_SCORE_WINDOW = 2048
+_SCORE_WINDOW_LEAD = 512
+
+
+def _flatten_dict_text(data: Dict[str, Any]) -> str:
+    """Join the leaf values of a (possibly nested) dict into plain text, ignoring keys."""
+    leaves = []
+    pending = deque([data])
+    while pending:
+        node = pending.popleft()
+        values = node.values() if isinstance(node, dict) else node
+        for value in values:
+            if isinstance(value, str):
+                leaves.append(value)
+            elif isinstance(value, (dict, list, tuple)):
+                pending.append(value)
+            elif value is not None:
+                leaves.append(str(value))
+    return ' '.join(leaves)
+
+
+# Content normalizers for _rank_results, dispatched on exact type (default: str)
+_CONTENT_COERCERS = {
+    str: lambda content: content,
+    dict: _flatten_dict_text,
+    bytes: lambda content: content.decode('utf-8', 'ignore'),
+}
+
+# Warmed embedding functions, keyed by vector store persist directory
+_MODEL_CACHE: Dict[str, Any] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def _fingerprint(content: str) -> int:
+    """Stable 64-bit fingerprint of a content string, used for deduplication."""
+    data = content.encode('utf-8', 'surrogatepass')
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def _score_window(content: str, query_words: frozenset) -> str:
+    """Trim long lowercased content to the part around its first query word."""
+    if len(content) <= _SCORE_WINDOW:
+        return content
+    hits = [pos for pos in (content.find(word) for word in query_words) if pos != -1]
+    if not hits:
+        return content[:_SCORE_WINDOW]
+    start = max(0, min(hits) - _SCORE_WINDOW_LEAD)
+    return content[start:start + _SCORE_WINDOW]
+
+
+@lru_cache(maxsize=4096)
+def _format_api_fields(name: str, docstring: Optional[str], params: Optional[str], return_type: Optional[str]) -> str:
+    """Format API metadata fields into readable content."""
+    parts = [f"API: {name}"]
+    
+    if docstring:
+        parts.append(f"Description: {docstring}")
+    
+    if params:
+        try:
+            params = orjson.loads(params)
+        except orjson.JSONDecodeError:
+            params = [params]
+        parts.append("Parameters:")
+        for param in params:
+            if isinstance(param, dict):
+                parts.append(f"- {param.get('name', '')}: {param.get('type', 'Any')}")
+            else:
+                parts.append(f"- {param}")
+    
+    if return_type:
+        parts.append(f"Returns: {return_type}")
+    
+    return '\n'.join(parts)
+
+
+@lru_cache(maxsize=4096)
+def _format_env_var_fields(name: str, description: Optional[str], is_required: bool, default_value: Optional[str]) -> str:
+    """Format environment variable fields into readable content."""
+    parts = [f"Environment Variable: {name}"]
+    
+    if description:
+        parts.append(f"Description: {description}")
+    
+    parts.append(f"Required: {'Yes' if is_required else 'No'}")
+    
+    if default_value:
+        parts.append(f"Default Value: {default_value}")
+    
+    return '\n'.join(parts)
+
+
+@dataclass(frozen=True)
+class _QueryCtx:
+    """Query-side state for relevance scoring, computed once per query."""
+    lower: str
+    words: frozenset
+    length: int
+
+    @classmethod
+    def from_query(cls, query: str) -> '_QueryCtx':
+        lower = str(query).lower()
+        return cls(lower=lower, words=frozenset(_TOK_RE.findall(lower)), length=len(lower))
 
 class ContextRetriever:
     """Enhanced context retriever with better context processing."""
@@ -15,6 +159,12 @@ class ContextRetriever:
         self.max_context_items = 5
         self.min_similarity_score = 0.2
         
+        # Shared pool for the I/O-bound vector and metadata searches
+        self._pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4))
+        
+        # Parsed repository info fields, keyed by field name as (version, value)
+        self._repo_cache: Dict[str, Tuple[int, Any]] = {}
+        
         # Enhanced key terms for better matching
         self.key_terms = {
             'api': ['function', 'method', 'endpoint', 'call', 'api', 'interface', 'use', 'using'],
@@ -22,42 +172,64 @@ class ContextRetriever:
             'documentation': ['documentation', 'guide', 'example', 'tutorial', 'readme', 'how to', 'usage'],
             'setup': ['setup', 'install', 'requirement', 'dependency', 'package', 'installation']
         }
+        # Freeze into interned tuples; these are iterated on every term expansion
+        self.key_terms = {
+            sys.intern(query_type): tuple(map(sys.intern, terms))
+            for query_type, terms in self.key_terms.items()
+        }
+        
+        # One alternation per query type to detect whether any key term is present
+        self.key_term_patterns = {
+            query_type: re.compile('|'.join(map(re.escape, terms)))
+            for query_type, terms in self.key_terms.items()
+        }
+
+    def preload_model(self) -> Optional[Any]:
+        """Warm the vector store collections and embedding function once per store."""
+        vector_store = getattr(self.storage, 'vector_store', None)
+        if vector_store is None:
+            return None
+
+        key = vector_store.persist_directory
+        with _MODEL_CACHE_LOCK:
+            if key not in _MODEL_CACHE:
+                # Touch each collection so ChromaDB opens its segments before the first query
+                for collection in vector_store.collections.values():
+                    collection.count()
+                _MODEL_CACHE[key] = vector_store.embedding_function
+                self.logger.info(f"Preloaded embedding model for {key}")
+            return _MODEL_CACHE[key]
 
     def get_context(self, processed_query: Dict[str, Any]) -> Dict[str, Any]:
         """Retrieve relevant context with improved search."""
         try:
             self.logger.info(f"Getting context for query: {processed_query}")
             context = {}
+            qctx = _QueryCtx.from_query(processed_query['original_query'])
             
-            # Get context for each query type
+            # Search all expanded terms in one batch per store, running the
+            # searches for every query type concurrently
+            searches = []
             for query_type in processed_query['query_type']:
-                results = []
                 search_terms = self._expand_search_terms(processed_query, query_type)
+                searches.append((
+                    query_type,
+                    self._pool.submit(self.storage.search_batch, search_terms, query_type),
+                    self._pool.submit(self._get_metadata_context_batch, search_terms, query_type)
+                ))
+            
+            # Get context for each query type
+            for query_type, vector_future, metadata_future in searches:
+                results = self._iter_search_results(vector_future.result(), metadata_future.result())
                 
-                for term in search_terms:
-                    # Search vector store
-                    vector_results = self.storage.search(term, query_type)
-                    if vector_results:
-                        if isinstance(vector_results, dict):
-                            # Handle structured results
-                            for result_type, items in vector_results.items():
-                                if isinstance(items, list):
-                                    results.extend(items)
-                        elif isinstance(vector_results, list):
-                            # Handle direct list results
-                            results.extend(vector_results)
-                    
-                    # Get metadata context
-                    metadata_results = self._get_metadata_context(term, query_type)
-                    if metadata_results:
-                        results.extend(metadata_results)
-                
-                if results:
-                    context[query_type] = self._rank_results(results, processed_query['original_query'])
+                # Results are streamed into ranking; skip query types with none at all
+                first = next(results, None)
+                if first is not None:
+                    context[query_type] = self._rank_results(chain((first,), results), qctx)
             
             # Add repository info if relevant
             if self._is_repo_info_relevant(processed_query):
-                repo_context = self._get_repository_info_context(processed_query)
+                repo_context = self._get_repository_info_context(processed_query, qctx)
                 if repo_context:
                     context['repository'] = repo_context
             
@@ -67,13 +239,35 @@ class ContextRetriever:
             self.logger.error(f"Error retrieving context: {e}")
             return {}
 
+    def _iter_search_results(
+        self,
+        vector_batch: List[Any],
+        metadata_batch: List[List[Dict[str, Any]]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield vector store and metadata results for each search term in turn."""
+        for vector_results, metadata_results in zip(vector_batch, metadata_batch):
+            # Merge vector store results
+            if vector_results:
+                if isinstance(vector_results, dict):
+                    # Handle structured results
+                    for result_type, items in vector_results.items():
+                        if isinstance(items, list):
+                            yield from items
+                elif isinstance(vector_results, list):
+                    # Handle direct list results
+                    yield from vector_results
+            
+            # Merge metadata context
+            if metadata_results:
+                yield from metadata_results
+
     def _expand_search_terms(self, processed_query: Dict[str, Any], query_type: str) -> List[str]:
         """Expand search terms for better coverage."""
         terms = {processed_query['original_query']}
         
         # Add type-specific expansions
-        if query_type in self.key_terms:
-            query_lower = processed_query['original_query'].lower()
+        query_lower = processed_query['original_query'].lower()
+        if query_type in self.key_terms and self.key_term_patterns[query_type].search(query_lower):
             for key_term in self.key_terms[query_type]:
                 if key_term in query_lower:
                     # Add variant without the key term
@@ -86,7 +280,7 @@ class ContextRetriever:
             if entity_value:
                 terms.add(str(entity_value))
                 # Add combinations with key terms
-                for key_term in self.key_terms.get(query_type, []):
+                for key_term in self.key_terms.get(query_type, ()):
                     terms.add(f"{key_term} {entity_value}")
         
         # Add significant word combinations
@@ -95,15 +289,28 @@ class ContextRetriever:
             for i in range(len(words)-1):
                 terms.add(' '.join(words[i:i+2]))
         
-        self.logger.info(f"Expanded terms for {query_type}: {terms}")
-        return list(terms)
+        # Collapse word-order variants and terms already covered by a longer term
+        canonical = {}
+        for term in terms:
+            if len(term) >= 2:
+                canonical.setdefault(' '.join(sorted(term.split())), term)
+        kept = []
+        for term in sorted(canonical.values(), key=len, reverse=True):
+            if not any(term in longer for longer in kept):
+                kept.append(term)
+
+        self.logger.info(f"Expanded terms for {query_type}: {kept}")
+        return kept
 
     
-    def _rank_results(self, results: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+    def _rank_results(self, results: Iterable[Dict[str, Any]], qctx: _QueryCtx) -> List[Dict[str, Any]]:
         """Rank results by relevance score with improved handling."""
         try:
             # Convert all results to a consistent format
             normalized_results = []
+            # Results still needing a score, grouped by content since the same
+            # content often comes back for several search terms
+            pending: Dict[str, List[int]] = {}
             for result in results:
                 if not isinstance(result, dict):
                     # Skip non-dictionary results
@@ -117,67 +324,162 @@ class ContextRetriever:
                 }
                 
                 # Extract content
-                if isinstance(result.get('content'), str):
-                    normalized_result['content'] = result['content']
-                elif isinstance(result.get('content'), dict):
-                    normalized_result['content'] = json.dumps(result['content'])
-                else:
-                    normalized_result['content'] = str(result.get('content', ''))
+                raw_content = result.get('content', '')
+                normalized_result['content'] = _CONTENT_COERCERS.get(type(raw_content), str)(raw_content)
                 
                 # Extract metadata
-                if isinstance(result.get('metadata'), dict):
-                    normalized_result['metadata'] = result['metadata']
+                metadata = result.get('metadata')
+                if type(metadata) is dict:
+                    normalized_result['metadata'] = metadata
                 
-                # Calculate or use existing relevance score
+                # Use existing relevance score, or defer to the batch scoring below
                 if '_relevance' in result:
                     normalized_result['_relevance'] = float(result['_relevance'])
                 else:
-                    normalized_result['_relevance'] = self._calculate_relevance_score(
-                        normalized_result['content'],
-                        query
-                    )
+                    pending.setdefault(normalized_result['content'], []).append(len(normalized_results))
                 
                 normalized_results.append(normalized_result)
             
-            # Sort by relevance
-            normalized_results.sort(key=lambda x: x['_relevance'], reverse=True)
+            # Score all pending contents in one vectorized pass
+            if pending:
+                scores = self._score_contents(list(pending), qctx)
+                for indices, score in zip(pending.values(), scores.tolist()):
+                    for idx in indices:
+                        normalized_results[idx]['_relevance'] = score
             
-            # Remove duplicates while preserving order
-            seen_content = set()
-            unique_results = []
-            for result in normalized_results:
-                content_hash = hash(result['content'])
-                if content_hash not in seen_content and result['_relevance'] >= self.min_similarity_score:
-                    seen_content.add(content_hash)
-                    unique_results.append(result)
+            # Select the highest scoring results above the threshold, keeping a buffer
+            # large enough to absorb duplicates (ties keep input order, as in a stable sort)
+            candidates = [
+                result for result in normalized_results
+                if result['_relevance'] >= self.min_similarity_score
+            ]
+            buffer_size = self.max_context_items * 4
+            unique_results = self._dedupe_results(
+                heapq.nlargest(buffer_size, candidates, key=itemgetter('_relevance'))
+            )
+            if len(unique_results) < self.max_context_items and len(candidates) > buffer_size:
+                # Too many duplicates in the buffer; rank every candidate instead
+                unique_results = self._dedupe_results(
+                    sorted(candidates, key=itemgetter('_relevance'), reverse=True)
+                )
             
-            return unique_results[:self.max_context_items]
+            return unique_results
             
         except Exception as e:
             self.logger.error(f"Error ranking results: {e}")
             return []
 
-    def _calculate_relevance_score(self, content: str, query: str) -> float:
-        """Calculate relevance score between content and query."""
+    def _dedupe_results(self, ranked: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Remove duplicate content from ranked results, up to max_context_items."""
+        seen_fingerprints = set()
+        unique_results = []
+        for result in ranked:
+            fingerprint = _fingerprint(result['content'])
+            if fingerprint not in seen_fingerprints:
+                seen_fingerprints.add(fingerprint)
+                unique_results.append(result)
+                if len(unique_results) == self.max_context_items:
+                    break
+        return unique_results
+
+    def _score_contents(self, contents: List[str], qctx: _QueryCtx) -> np.ndarray:
+        """Vectorized equivalent of _calculate_relevance_score over many contents."""
+        count = len(contents)
+        if not count or not qctx.words:
+            return np.zeros(count)
+
+        query_words = qctx.words
+        lowered = [_score_window(content.lower(), query_words) for content in contents]
+
+        # Word sets are only needed for Jaccard similarity or for long queries
+        short_query = len(query_words) <= _SHORT_QUERY_WORDS
+        if fuzz_process is None or not short_query:
+            # Large ASCII batches go through the JIT-compiled token hashing kernel
+            if _NUMBA_AVAILABLE and count >= NUMBA_MIN_BATCH and all(content.isascii() for content in lowered):
+                common, sizes = token_overlap(lowered, hash_query_words(query_words))
+            else:
+                word_sets = [set(_TOK_RE.findall(content)) for content in lowered]
+                common = np.fromiter((len(query_words & words) for words in word_sets), dtype=np.float64, count=count)
+                sizes = np.fromiter((len(words) for words in word_sets), dtype=np.float64, count=count)
+        exact = np.fromiter((qctx.lower in content for content in lowered), dtype=np.bool_, count=count)
+
+        # Token-set similarity (RapidFuzz if installed, else Jaccard) plus exact-match boost,
+        # blended with the word match ratio
+        if fuzz_process is not None:
+            base_scores = fuzz_process.cdist(
+                [qctx.lower], lowered, scorer=fuzz.token_set_ratio, dtype=np.float64
+            )[0] / 100.0
+        else:
+            base_scores = common / (len(query_words) + sizes - common)
+        base_scores = base_scores + 0.2 * exact
+        if short_query:
+            hits = np.fromiter(
+                (sum(word in content for word in query_words) for content in lowered),
+                dtype=np.float64,
+                count=count
+            )
+        else:
+            hits = common
+        word_match_ratios = hits / len(query_words)
+        scores = np.clip(base_scores * 0.6 + word_match_ratios * 0.4, 0.0, 1.0)
+
+        # Fast-path scores for near-identical and tiny inputs, as in the scalar version
+        lengths = np.fromiter((len(content) for content in lowered), dtype=np.float64, count=count)
+        near_identical = exact & (qctx.length >= 0.8 * lengths)
+        scores = np.where(
+            near_identical,
+            np.minimum(1.0, 0.8 + 0.2 * qctx.length / np.maximum(lengths, 1.0)),
+            scores
+        )
+        tiny = ~near_identical & ((lengths < 4) | (qctx.length < 2))
+        scores = np.where(tiny, exact.astype(np.float64), scores)
+        return scores
+
+    def _calculate_relevance_score(self, content: str, qctx: _QueryCtx) -> float:
+        """Calculate relevance score between content and a precomputed query context."""
         try:
-            if not content or not query:
+            if not content or not qctx.length:
                 return 0.0
                 
-            # Convert content to string if it's not already
-            content_str = str(content).lower()
-            query_str = str(query).lower()
+            query_words = qctx.words
+            if not query_words:
+                return 0.0
+            
+            # Convert content to string if it's not already, trimming long content
+            content_str = _score_window(str(content).lower(), query_words)
+            query_str = qctx.lower
+            content_length = len(content_str)
+            
+            # Fast paths for identical, near-identical and tiny inputs
+            if content_str == query_str:
+                return 1.0
+            if qctx.length >= 0.8 * content_length and query_str in content_str:
+                return min(1.0, 0.8 + 0.2 * qctx.length / content_length)
+            if content_length < 4 or qctx.length < 2:
+                return 1.0 if query_str in content_str else 0.0
             
-            # Calculate base similarity score
-            base_score = SequenceMatcher(None, content_str, query_str).ratio()
+            # Calculate base similarity score (RapidFuzz token-set ratio if installed,
+            # else Jaccard similarity of word sets)
+            content_words = None
+            if fuzz is not None:
+                base_score = fuzz.token_set_ratio(content_str, query_str) / 100.0
+            else:
+                content_words = set(_TOK_RE.findall(content_str))
+                base_score = len(query_words & content_words) / len(query_words | content_words)
             
             # Boost score for exact matches
-            if query_str in content_str:
+            if content_str.find(query_str) != -1:
                 base_score += 0.2
             
-            # Boost score for partial word matches
-            query_words = set(query_str.split())
-            content_words = set(content_str.split())
-            word_match_ratio = len(query_words.intersection(content_words)) / len(query_words)
+            # Boost score for partial word matches; short queries use substring
+            # search rather than building the content word set
+            if len(query_words) <= _SHORT_QUERY_WORDS:
+                hits = sum(word in content_str for word in query_words)
+            else:
+                if content_words is None:
+                    content_words = set(_TOK_RE.findall(content_str))
+                hits = len(query_words & content_words)
+            word_match_ratio = hits / len(query_words)
             
             # Combine scores with weights
             final_score = (base_score * 0.6) + (word_match_ratio * 0.4)
@@ -189,98 +491,98 @@ class ContextRetriever:
             self.logger.error(f"Error calculating relevance score: {e}")
             return 0.0
 
-    def _get_metadata_context(self, query: str, query_type: str) -> List[Dict[str, Any]]:
-        """Get context from metadata store based on query type."""
+    def _get_metadata_context_batch(self, queries: List[str], query_type: str) -> List[List[Dict[str, Any]]]:
+        """Get metadata context for several queries, returning one result list per query."""
         try:
-            results = []
+            batch_results = [[] for _ in queries]
             
             # Get API metadata for API queries
             if query_type == 'api':
-                api_results = self.storage.metadata_store.search_metadata(query)
-                if isinstance(api_results, dict) and 'apis' in api_results:
-                    for api in api_results['apis']:
-                        results.append({
-                            'content': self._format_api_content(api),
-                            'metadata': {
-                                'type': 'api',
-                                'name': api.get('name', ''),
-                                'file_path': api.get('file_path', '')
-                            }
-                        })
+                api_batch = self.storage.metadata_store.search_metadata_batch(queries)
+                for results, api_results in zip(batch_results, api_batch):
+                    if isinstance(api_results, dict) and 'apis' in api_results:
+                        for api in api_results['apis']:
+                            results.append({
+                                'content': self._format_api_content(api),
+                                'metadata': {
+                                    'type': 'api',
+                                    'name': api.get('name', ''),
+                                    'file_path': api.get('file_path', '')
+                                }
+                            })
             
             # Get environment variables for env/setup queries
             if query_type in ['env', 'setup']:
                 env_vars = self.storage.metadata_store.get_env_variables()
-                for var in env_vars:
-                    if self._calculate_relevance_score(f"{var['name']} {var.get('description', '')}", query) >= self.min_similarity_score:
-                        results.append({
-                            'content': self._format_env_var_content(var),
-                            'metadata': {
-                                'type': 'env_var',
-                                'name': var['name'],
-                                'is_required': var.get('is_required', False)
-                            }
-                        })
+                for query, results in zip(queries, batch_results):
+                    qctx = _QueryCtx.from_query(query)
+                    for var in env_vars:
+                        if self._calculate_relevance_score(f"{var['name']} {var.get('description', '')}", qctx) >= self.min_similarity_score:
+                            results.append({
+                                'content': self._format_env_var_content(var),
+                                'metadata': {
+                                    'type': 'env_var',
+                                    'name': var['name'],
+                                    'is_required': var.get('is_required', False)
+                                }
+                            })
             
-            return results
+            return batch_results
             
         except Exception as e:
             self.logger.error(f"Error getting metadata context: {e}")
-            return []
+            return [[] for _ in queries]
 
     def _format_api_content(self, api: Dict[str, Any]) -> str:
         """Format API metadata into readable content."""
-        parts = [f"API: {api.get('name', '')}"]
-        
-        if api.get('docstring'):
-            parts.append(f"Description: {api['docstring']}")
-        
-        if api.get('parameters'):
-            params = api['parameters']
-            if isinstance(params, str):
-                try:
-                    params = json.loads(params)
-                except:
-                    params = [params]
-            parts.append("Parameters:")
-            for param in params:
-                if isinstance(param, dict):
-                    parts.append(f"- {param.get('name', '')}: {param.get('type', 'Any')}")
-                else:
-                    parts.append(f"- {param}")
-        
-        if api.get('return_type'):
-            parts.append(f"Returns: {api['return_type']}")
-        
-        return '\n'.join(parts)
+        params = api.get('parameters')
+        if params and not isinstance(params, str):
+            # Cache key must be hashable; the formatter parses it back
+            params = orjson.dumps(params).decode()
+        return _format_api_fields(
+            api.get('name', ''),
+            api.get('docstring'),
+            params,
+            api.get('return_type')
+        )
 
     def _format_env_var_content(self, var: Dict[str, Any]) -> str:
         """Format environment variable metadata into readable content."""
-        parts = [f"Environment Variable: {var['name']}"]
-        
-        if var.get('description'):
-            parts.append(f"Description: {var['description']}")
-        
-        parts.append(f"Required: {'Yes' if var.get('is_required') else 'No'}")
-        
-        if var.get('default_value'):
-            parts.append(f"Default Value: {var['default_value']}")
-        
-        return '\n'.join(parts)
+        return _format_env_var_fields(
+            var['name'],
+            var.get('description'),
+            bool(var.get('is_required')),
+            var.get('default_value')
+        )
 
     def _is_repo_info_relevant(self, processed_query: Dict[str, Any]) -> bool:
         """Check if repository info is relevant to the query."""
         query_lower = processed_query['original_query'].lower()
-        relevant_terms = {
-            'setup', 'install', 'requirement', 'dependency', 'package', 
-            'version', 'configuration', 'repository', 'structure'
-        }
         return bool(
-            any(term in query_lower for term in relevant_terms) or 
+            _REPO_INFO_RE.search(query_lower) or 
             'setup' in processed_query['query_type']
         )
 
-    def _get_repository_info_context(self, processed_query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _parse_repo_field(self, repo_info: Dict[str, Any], key: str) -> Any:
+        """Parse a JSON-encoded repository info field, reusing the last parse if unchanged."""
+        raw = repo_info[key]
+        if not isinstance(raw, (str, bytes)):
+            return raw
+
+        version = hash(raw)
+        cached = self._repo_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        parsed = orjson.loads(raw)
+        self._repo_cache[key] = (version, parsed)
+        return parsed
+
+    def _get_repository_info_context(
+        self,
+        processed_query: Dict[str, Any],
+        qctx: Optional[_QueryCtx] = None
+    ) -> List[Dict[str, Any]]:
         """Get context from repository info with improved relevance checking."""
         try:
             repo_info = self.storage.metadata_store.get_repository_info()
@@ -288,14 +590,15 @@ class ContextRetriever:
                 return []
 
             context = []
-            query = processed_query['original_query']
+            if qctx is None:
+                qctx = _QueryCtx.from_query(processed_query['original_query'])
 
             # Process repository statistics
             if 'stats' in repo_info:
                 try:
-                    stats = json.loads(repo_info['stats'])
+                    stats = self._parse_repo_field(repo_info, 'stats')
                     stats_content = f"Repository Statistics:\n{json.dumps(stats, indent=2)}"
-                    relevance = self._calculate_relevance_score(stats_content, query)
+                    relevance = self._calculate_relevance_score(stats_content, qctx)
                     if relevance >= self.min_similarity_score:
                         context.append({
                             'content': stats_content,
@@ -308,11 +611,11 @@ class ContextRetriever:
             # Process summaries
             if 'summaries' in repo_info:
                 try:
-                    summaries = json.loads(repo_info['summaries'])
+                    summaries = self._parse_repo_field(repo_info, 'summaries')
                     for summary in summaries:
                         if isinstance(summary, dict):
                             content = summary.get('content', '')
-                            relevance = self._calculate_relevance_score(content, query)
+                            relevance = self._calculate_relevance_score(content, qctx)
                             if relevance >= self.min_similarity_score:
                                 context.append({
                                     'content': content,
@@ -1,17 +1,68 @@
-from typing import Dict, List, Any, Optional
-from openai import OpenAI, AsyncOpenAI
+from typing import Dict, List, Any, Optional, AsyncIterator, Tuple
+from openai import OpenAI, AsyncOpenAI, DefaultAsyncHttpxClient
+import httpx
+import asyncio
+import copy
+import hashlib
+import io
 import logging
 import json
+from operator import itemgetter
+from cachetools import TTLCache
+from .request_batcher import AsyncBatcher
 from tenacity import retry, stop_after_attempt, wait_exponential
 import os
+import re
 from difflib import SequenceMatcher
 
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Tokens for the phrase similarity prefilter, and the share of a phrase's
+# tokens that must appear in the answer before fuzzy matching is attempted
+_TOKEN_RE = re.compile(r'\w{3,}')
+_MIN_PHRASE_OVERLAP = 0.3
+
+# Smallest remainder worth keeping when truncating the last context item to fit
+_MIN_TRUNCATED_TOKENS = 50
+
 class LLMInterface:
     """Interface for interacting with GPT-4 with strict RAG enforcement."""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, batch_requests: bool = False):
         self.logger = logging.getLogger(__name__)
-        self.client = AsyncOpenAI(api_key=api_key)
+        # Share one pooled HTTP client so requests reuse keep-alive connections
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=25)
+            )
+        )
+        
+        # Cap in-flight completions; the semaphore is recreated per event loop
+        self._max_concurrency = max(1, int(os.getenv('OPENAI_MAX_CONC', '20')))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Follow-up questions are short and low-stakes, so use a smaller model
+        self.followup_model = os.getenv('FOLLOWUP_MODEL', 'gpt-4o-mini')
+        
+        # Optionally coalesce concurrent completions into shared requests
+        self._batcher = AsyncBatcher(self._create_completion, "gpt-4-0125-preview") if batch_requests else None
+        
+        # Completed responses keyed by query and context, plus per-key locks so
+        # concurrent identical requests wait for one completion
+        self._response_cache = TTLCache(maxsize=1024, ttl=3600)
+        # Each key maps to [lock, callers holding or awaiting it]; the entry is
+        # dropped when the count reaches zero, never while a waiter is queued
+        self._response_locks: Dict[bytes, List] = {}
         
         # Enhanced base prompts
         self.base_prompts = {
@@ -51,53 +102,81 @@ class LLMInterface:
             4. Do not use any knowledge outside of the provided context
             5. Only list dependencies that appear in the context"""
         }
+        
+        # Identical for every call so the prompt prefix can be cached server-side
+        self._static_system_prompt = self._construct_system_prompt()
+        
+        # Token budget for context in the user prompt; counts fall back to a
+        # characters/4 estimate when tiktoken or its encoding is unavailable
+        self.context_token_budget = 6000
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.encoding_for_model("gpt-4-0125-preview")
+            except Exception as e:
+                self.logger.warning(f"Could not load tiktoken encoding: {e}")
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def generate_response(
         self,
         query: str,
         context: Dict[str, Any],
         processed_query: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Generate a strictly RAG-based response using GPT-4."""
+        """Generate a strictly RAG-based response using GPT-4.
+
+        Responses are cached for an hour per query and context, so repeated
+        questions over the same context skip the completion call.
+        """
+        context = self._dedupe_context(context)
+        key = self._response_cache_key(query, context)
+        entry = self._response_locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
         try:
-            self.logger.info(f"Generating response for query: {query}")
-            self.logger.info(f"Context types available: {list(context.keys())}")
+            async with entry[0]:
+                cached = self._get_cached_response(key)
+                if cached is not None:
+                    return cached
+                response = await self._generate_response_uncached(query, context, processed_query)
+                self._response_cache[key] = copy.deepcopy(response)
+                return response
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._response_locks[key]
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    async def _generate_response_uncached(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        processed_query: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Generate a response with GPT-4, bypassing the response cache."""
+        try:
+            self.logger.info("Generating response for query: %s", query)
+            self.logger.info("Context types available: %s", list(context.keys()))
             
             # Verify context availability
             if not self._has_sufficient_context(context):
                 self.logger.warning("Insufficient context available")
                 return self._create_insufficient_context_response(query)
 
-            # Construct prompts
-            system_prompt = self._construct_system_prompt(processed_query['query_type'])
-            user_prompt = self._construct_user_prompt(query, context, processed_query)
-            
-            # Enhanced RAG enforcement reminder
-            rag_reminder = {
-                "role": "system",
-                "content": """CRITICAL REMINDER:
-                1. Only use information explicitly present in the provided context
-                2. If you're unsure or information is missing, say "Based on the provided context, I cannot answer this specific aspect"
-                3. Cite specific files when providing information
-                4. Do not use any external knowledge about Whisper"""
-            }
-            
             # Call GPT-4 with enhanced enforcement
             self.logger.info("Calling GPT-4 with enhanced enforcement")
-            response = await self.client.chat.completions.create(
-                model="gpt-4-0125-preview",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    rag_reminder,
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
-            
-            # Process and verify response
-            processed_response = self._process_response(response, context)
+            messages = self._build_messages(query, context, processed_query)
+            if self._batcher is not None:
+                answer, model, finish_reason = await self._batcher.submit(messages)
+                processed_response = self._build_response(answer, model, finish_reason, context)
+            else:
+                response = await self._create_completion(
+                    model="gpt-4-0125-preview",
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=2000
+                )
+                
+                # Process and verify response
+                processed_response = self._process_response(response, context)
             
             # Verify context usage
             if not self._verify_response_uses_context(processed_response, context):
@@ -110,6 +189,140 @@ class LLMInterface:
             self.logger.error(f"Error generating response: {e}")
             raise
 
+    async def generate_response_stream(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        processed_query: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a strictly RAG-based response from GPT-4.
+
+        Yields ``{'type': 'delta', 'content': str}`` events as tokens arrive,
+        followed by a single ``{'type': 'final', 'response': dict}`` event
+        holding the same response ``generate_response`` would return.
+        """
+        self.logger.info("Streaming response for query: %s", query)
+        
+        context = self._dedupe_context(context)
+        key = self._response_cache_key(query, context)
+        cached = self._get_cached_response(key)
+        if cached is not None:
+            yield {'type': 'final', 'response': cached}
+            return
+        
+        # Verify context availability
+        if not self._has_sufficient_context(context):
+            self.logger.warning("Insufficient context available")
+            yield {'type': 'final', 'response': self._create_insufficient_context_response(query)}
+            return
+
+        self.logger.info("Calling GPT-4 with streaming enabled")
+        answer = io.StringIO()
+        model = None
+        finish_reason = None
+        # Hold a concurrency slot for the whole stream, not just its creation
+        async with self._get_semaphore():
+            stream = await self.client.chat.completions.create(
+                model="gpt-4-0125-preview",
+                messages=self._build_messages(query, context, processed_query),
+                temperature=0.7,
+                max_tokens=2000,
+                stream=True
+            )
+            async for chunk in stream:
+                model = chunk.model or model
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                finish_reason = choice.finish_reason or finish_reason
+                if choice.delta.content:
+                    answer.write(choice.delta.content)
+                    yield {'type': 'delta', 'content': choice.delta.content}
+
+        processed_response = self._build_response(answer.getvalue(), model, finish_reason, context)
+        
+        # Verify context usage
+        if not self._verify_response_uses_context(processed_response, context):
+            self.logger.warning("Response may not be strictly based on context")
+            processed_response = self._add_context_warning(processed_response)
+        
+        self._response_cache[key] = copy.deepcopy(processed_response)
+        yield {'type': 'final', 'response': processed_response}
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the completion concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _create_completion(self, **kwargs) -> Any:
+        """Create a chat completion, bounded by the concurrency semaphore."""
+        async with self._get_semaphore():
+            return await self.client.chat.completions.create(**kwargs)
+
+    def _dedupe_context(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of the context without repeated item content within each list."""
+        deduped = {}
+        for context_type, items in context.items():
+            if not isinstance(items, list):
+                deduped[context_type] = items
+                continue
+            seen = set()
+            unique_items = []
+            for item in items:
+                if isinstance(item, dict):
+                    digest = hashlib.sha1(
+                        str(item.get('content', '')).encode('utf-8', 'surrogatepass')
+                    ).digest()
+                    if digest in seen:
+                        continue
+                    seen.add(digest)
+                unique_items.append(item)
+            deduped[context_type] = unique_items
+        return deduped
+
+    def _response_cache_key(self, query: str, context: Dict[str, Any]) -> bytes:
+        """Hash the normalized query together with the context it is answered from."""
+        digest = hashlib.sha256(query.strip().lower().encode('utf-8'))
+        for context_type, items in context.items():
+            digest.update(b'\0' + str(context_type).encode('utf-8'))
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                if isinstance(item, dict):
+                    source = item.get('metadata', {}).get('file_path', '')
+                    digest.update(f"\0{source}\0{item.get('content', '')}".encode('utf-8', 'surrogatepass'))
+        return digest.digest()
+
+    def _get_cached_response(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached response, flagged as a cache hit."""
+        cached = self._response_cache.get(key)
+        if cached is None:
+            return None
+        self.logger.info("Serving response from LLM response cache")
+        response = copy.deepcopy(cached)
+        response.setdefault('metadata', {})['cache_hit'] = True
+        return response
+
+    def _build_messages(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        processed_query: Dict[str, Any]
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for a RAG query.
+
+        The system message is identical for every call and all per-query
+        content sits in the user message, so the prompt prefix stays
+        byte-identical and eligible for OpenAI prompt caching.
+        """
+        return [
+            {"role": "system", "content": self._static_system_prompt},
+            {"role": "user", "content": self._construct_user_prompt(query, context, processed_query)}
+        ]
+
     def _has_sufficient_context(self, context: Dict[str, Any]) -> bool:
         """Enhanced check for sufficient context."""
         if not context:
@@ -152,8 +365,8 @@ class LLMInterface:
             }
         }
 
-    def _construct_system_prompt(self, query_types: List[str]) -> str:
-        """Construct enhanced system prompt."""
+    def _construct_system_prompt(self) -> str:
+        """Construct the static system prompt covering every query type."""
         base_prompt = """You are an AI assistant specifically focused on the OpenAI Whisper repository.
         Your responses must be based EXCLUSIVELY on the provided context.
         
@@ -170,10 +383,15 @@ class LLMInterface:
         3. Source file references
         4. Clear indication of any aspects you cannot answer due to missing context"""
         
-        type_specific_prompts = [self.base_prompts.get(qtype, "") for qtype in query_types]
-        full_prompt = base_prompt + "\n\n" + "\n\n".join(filter(None, type_specific_prompts))
+        # Enhanced RAG enforcement reminder
+        rag_reminder = """CRITICAL REMINDER:
+            1. Only use information explicitly present in the provided context
+            2. If you're unsure or information is missing, say "Based on the provided context, I cannot answer this specific aspect"
+            3. Cite specific files when providing information
+            4. Do not use any external knowledge about Whisper"""
         
-        return full_prompt
+        type_specific_prompts = [self.base_prompts[qtype] for qtype in sorted(self.base_prompts)]
+        return "\n\n".join([base_prompt, rag_reminder, *type_specific_prompts])
 
     def _construct_user_prompt(
         self,
@@ -181,45 +399,113 @@ class LLMInterface:
         context: Dict[str, Any],
         processed_query: Dict[str, Any]
     ) -> str:
-        """Construct enhanced user prompt."""
-        prompt_parts = [
-            "Answer the following question using ONLY the context provided below.",
-            "If you cannot find specific information in the context, explicitly say so.",
-            f"\nQuestion: {query}\n",
-            "\nAvailable Context Information:"
-        ]
+        """Construct enhanced user prompt.
+
+        Context sections and their items are emitted in a deterministic order
+        and the question comes last, so prompts for the same context share
+        the longest possible prefix.
+        """
+        buf = io.StringIO()
+        write = buf.write
+        write("Answer the question at the end using ONLY the context provided below.\n")
+        write("If you cannot find specific information in the context, explicitly say so.\n")
+        write("\nAvailable Context Information:")
         
-        # Add setup/dependency context first if relevant
-        if 'setup' in context or any(term in query.lower() for term in ['dependency', 'requirement', 'setup']):
-            setup_items = context.get('setup', [])
-            if setup_items:
-                prompt_parts.append("\nSetup and Requirements Information:")
-                for item in setup_items:
+        query_types = processed_query['query_type']
+        section_titles = {'setup': "Setup and Requirements Information", 'repository_info': "Repository Information"}
+        
+        # Format items per section in rank order as (file_path, header, body).
+        # The same item is often retrieved for several query types; emit it once.
+        sections = {}
+        emitted = set()
+        for context_type in sorted(context):
+            if context_type not in query_types and context_type not in section_titles:
+                continue
+            items = context[context_type]
+            if not isinstance(items, list):
+                continue
+            entries = []
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                file_path = str(item.get('metadata', {}).get('file_path', ''))
+                item_key = (file_path, str(item.get('content', '')))
+                if item_key in emitted:
+                    continue
+                emitted.add(item_key)
+                if context_type == 'repository_info':
+                    entries.append((file_path, '', self._format_context_item(item, 'repo')))
+                else:
                     source = item.get('metadata', {}).get('file_path', 'unknown')
-                    content = self._format_context_item(item, 'setup')
-                    prompt_parts.append(f"\nFrom {source}:\n{content}")
+                    content = self._format_context_item(item, context_type)
+                    entries.append((file_path, f"From {source}:\n", content))
+            if entries:
+                sections[context_type] = entries
         
-        # Add specific context based on query type
-        for query_type in processed_query['query_type']:
-            if items := context.get(query_type):
-                prompt_parts.append(f"\n{query_type.upper()} Information:")
-                for item in items:
-                    if isinstance(item, dict):
-                        source = item.get('metadata', {}).get('file_path', 'unknown')
-                        content = self._format_context_item(item, query_type)
-                        prompt_parts.append(f"\nFrom {source}:\n{content}")
+        # Keep the highest ranked items within the token budget, then emit them by file path
+        for context_type, entries in self._fit_context(sections, self.context_token_budget).items():
+            write(f"\n\n{section_titles.get(context_type, f'{context_type.upper()} Information')}:")
+            for _, header, body in sorted(entries, key=itemgetter(0)):
+                write(f"\n\n{header}{body}")
         
-        # Add repository info if available
-        if repo_info := context.get('repository_info', []):
-            prompt_parts.append("\nRepository Information:")
-            for item in repo_info:
-                if isinstance(item, dict):
-                    content = self._format_context_item(item, 'repo')
-                    prompt_parts.append(f"\n{content}")
+        write("\n\nIMPORTANT: Your response must ONLY use information from the above context. If specific information isn't in the context, explicitly say so.")
+        
+        # Per-query selections go at the tail
+        focus = [qtype for qtype in query_types if qtype in self.base_prompts]
+        if focus:
+            write(f"\nFollow the instructions for these query types: {', '.join(focus)}")
+        write(f"\n\nQuestion: {query}")
         
-        prompt_parts.append("\nIMPORTANT: Your response must ONLY use information from the above context. If specific information isn't in the context, explicitly say so.")
+        return buf.getvalue()
+
+    def _fit_context(
+        self,
+        sections: Dict[str, List[Tuple[str, str, str]]],
+        budget: int
+    ) -> Dict[str, List[Tuple[str, str, str]]]:
+        """Select context entries within a token budget, best ranked first.
+
+        Entries are taken round-robin by rank across sections. The first entry
+        that does not fit is truncated to the remaining budget (keeping its
+        source header) and everything after it is dropped.
+        """
+        kept = {context_type: [] for context_type in sections}
+        remaining = budget
+        depth = max((len(entries) for entries in sections.values()), default=0)
+        for rank in range(depth):
+            for context_type, entries in sections.items():
+                if remaining <= 0:
+                    break
+                if rank >= len(entries):
+                    continue
+                file_path, header, body = entries[rank]
+                header_tokens = self._count_tokens(header)
+                cost = header_tokens + self._count_tokens(body)
+                if cost <= remaining:
+                    kept[context_type].append(entries[rank])
+                    remaining -= cost
+                else:
+                    if remaining - header_tokens >= _MIN_TRUNCATED_TOKENS:
+                        body = self._truncate_tokens(body, remaining - header_tokens)
+                        kept[context_type].append((file_path, header, f"{body}\n[truncated]"))
+                    remaining = 0
         
-        return "\n".join(prompt_parts)
+        dropped = sum(len(entries) for entries in sections.values()) - sum(len(entries) for entries in kept.values())
+        if dropped:
+            self.logger.info("Dropped %d context items to fit the %d token budget", dropped, budget)
+        return {context_type: entries for context_type, entries in kept.items() if entries}
+
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens in text for the GPT-4 encoding."""
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return len(text) // 4 + 1
+
+    def _truncate_tokens(self, text: str, max_tokens: int) -> str:
+        """Truncate text to at most max_tokens tokens."""
+        if self._encoding is not None:
+            return self._encoding.decode(self._encoding.encode(text, disallowed_special=())[:max_tokens])
+        return text[:max_tokens * 4]
 
     def _format_context_item(self, item: Dict[str, Any], context_type: str) -> str:
         """Format context item with enhanced attribution."""
@@ -260,50 +546,60 @@ class LLMInterface:
             self.logger.warning("No sources cited in response")
             return False
         
-        # Check for context content usage
-        context_used = False
-        significant_phrase_found = False
+        # Context is used if any item shares a significant term or phrase with the answer
+        contents = [
+            str(item['content']).lower()
+            for items in context.values() if isinstance(items, list)
+            for item in items if isinstance(item, dict) and 'content' in item
+        ]
         
-        for items in context.values():
-            if isinstance(items, list):
-                for item in items:
-                    if isinstance(item, dict) and 'content' in item:
-                        content = str(item['content']).lower()
-                        
-                        # Check for significant phrase overlap
-                        phrases = [p.strip() for p in content.split('.') if len(p.strip().split()) > 3]
-                        for phrase in phrases:
-                            if self._has_similar_phrase(phrase, answer):
-                                significant_phrase_found = True
-                                break
-                        
-                        # Check for significant terms
-                        if not significant_phrase_found:
-                            terms = [term for term in content.split() if len(term) > 4]
-                            if any(term in answer for term in terms):
-                                context_used = True
-                                break
-                    
-                    if significant_phrase_found:
-                        return True
+        # Check for significant terms first; set lookups are far cheaper than phrase matching
+        answer_words = answer.split()
+        answer_word_set = set(answer_words)
+        if any(len(term) > 4 and term in answer_word_set for content in contents for term in content.split()):
+            return True
         
-        return context_used
+        # Check for significant phrase overlap, skipping phrases that share
+        # too few tokens with the answer to be similar
+        answer_tokens = frozenset(_TOKEN_RE.findall(answer))
+        return any(
+            self._has_similar_phrase(phrase, answer, answer_words)
+            for content in contents
+            for phrase in (p.strip() for p in content.split('.'))
+            if len(phrase.split()) > 3 and self._token_overlap(phrase, answer_tokens) >= _MIN_PHRASE_OVERLAP
+        )
 
-    def _has_similar_phrase(self, phrase: str, text: str, threshold: float = 0.8) -> bool:
-        """Check for similar phrases in text."""
-        phrase = phrase.strip().lower()
-        text = text.lower()
-        
+    def _token_overlap(self, phrase: str, answer_tokens: frozenset) -> float:
+        """Fraction of a phrase's tokens that also occur in the answer."""
+        phrase_tokens = frozenset(_TOKEN_RE.findall(phrase))
+        return len(phrase_tokens & answer_tokens) / max(1, len(phrase_tokens))
+
+    def _has_similar_phrase(
+        self,
+        phrase: str,
+        text_lower: str,
+        text_words_lower: Optional[List[str]] = None,
+        threshold: float = 0.8
+    ) -> bool:
+        """Check for similar phrases in text.
+
+        ``phrase`` and ``text_lower`` must already be stripped and lowercased;
+        ``text_words_lower`` is ``text_lower.split()``, computed if omitted.
+        """
         # Direct containment
-        if phrase in text:
+        if phrase in text_lower:
             return True
         
         # Similarity check for substrings
         phrase_words = phrase.split()
         if len(phrase_words) < 3:
             return False
+        
+        if fuzz is not None:
+            cutoff = threshold * 100
+            return fuzz.partial_ratio(phrase, text_lower, score_cutoff=cutoff) >= cutoff
             
-        text_words = text.split()
+        text_words = text_words_lower if text_words_lower is not None else text_lower.split()
         for i in range(len(text_words) - len(phrase_words) + 1):
             window = ' '.join(text_words[i:i + len(phrase_words)])
             if SequenceMatcher(None, phrase, window).ratio() >= threshold:
@@ -313,8 +609,22 @@ class LLMInterface:
 
     def _process_response(self, response: Any, context: Dict[str, Any]) -> Dict[str, Any]:
         """Process and format the LLM response."""
+        return self._build_response(
+            response.choices[0].message.content,
+            response.model,
+            response.choices[0].finish_reason,
+            context
+        )
+
+    def _build_response(
+        self,
+        answer: str,
+        model: Optional[str],
+        finish_reason: Optional[str],
+        context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the response dict from a completed answer."""
         sources = self._extract_sources(context)
-        answer = response.choices[0].message.content
 
         # Ensure source citations are present
         if sources and not any(source['file'] in answer for source in sources):
@@ -326,28 +636,47 @@ class LLMInterface:
             'answer': answer,
             'sources': sources,
             'metadata': {
-                'model': response.model,
-                'finish_reason': response.choices[0].finish_reason,
+                'model': model,
+                'finish_reason': finish_reason,
                 'context_types_used': list(context.keys())
             }
         }
 
     def _extract_sources(self, context: Dict[str, Any]) -> List[Dict[str, str]]:
         """Extract and deduplicate source references."""
-        sources = []
+        # Keyed by (type, file) to avoid duplicates while preserving order
+        sources = {}
         
         for context_type, items in context.items():
             if isinstance(items, list):
                 for item in items:
-                    if isinstance(item, dict) and 'metadata' in item and 'file_path' in item['metadata']:
-                        source = {
+                    if isinstance(item, dict) and isinstance(metadata := item.get('metadata'), dict) and 'file_path' in metadata:
+                        file_path = metadata['file_path']
+                        sources.setdefault((context_type, file_path), {
                             'type': context_type,
-                            'file': item['metadata']['file_path']
-                        }
-                        if source not in sources:  # Avoid duplicates while preserving order
-                            sources.append(source)
+                            'file': file_path
+                        })
         
-        return sources
+        return list(sources.values())
+
+    async def generate_response_with_followups(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        processed_query: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Generate a response and follow-up questions concurrently.
+
+        Follow-ups are generated from the query and context rather than the
+        answer, so both completions run at the same time. They are returned
+        under ``followup_questions`` in the response.
+        """
+        response, followups = await asyncio.gather(
+            self.generate_response(query, context, processed_query),
+            self._generate_followups_from_context(query, context)
+        )
+        response['followup_questions'] = followups
+        return response
 
     async def generate_followup_questions(
         self,
@@ -356,8 +685,7 @@ class LLMInterface:
         context: Dict[str, Any]
     ) -> List[str]:
         """Generate contextually relevant follow-up questions."""
-        try:
-            prompt = f"""Based on ONLY the provided context from the Whisper repository:
+        prompt = f"""Based on ONLY the provided context from the Whisper repository:
 
             Original question: "{query}"
             Response provided: "{response}"
@@ -368,15 +696,44 @@ class LLMInterface:
             3. Help deepen understanding of the specific content covered
 
             Do NOT generate questions about topics not covered in the context."""
-            
-            response = await self.client.chat.completions.create(
-                model="gpt-4-0125-preview",
+        return await self._request_followups(prompt)
+
+    async def _generate_followups_from_context(self, query: str, context: Dict[str, Any]) -> List[str]:
+        """Generate follow-up questions from the query and context alone."""
+        excerpts = []
+        for items in context.values():
+            if isinstance(items, list):
+                for item in items:
+                    if isinstance(item, dict):
+                        source = item.get('metadata', {}).get('file_path', 'unknown')
+                        excerpts.append(f"- {source}: {str(item.get('content', ''))[:300]}")
+        
+        context_summary = "\n".join(excerpts)
+        prompt = f"""Based on ONLY the provided context from the Whisper repository:
+
+            Original question: "{query}"
+            Context excerpts:
+{context_summary}
+
+            Generate 3 relevant follow-up questions that:
+            1. Only reference information available in the provided context
+            2. Focus on technical aspects mentioned in the context
+            3. Help deepen understanding of the specific content covered
+
+            Do NOT generate questions about topics not covered in the context."""
+        return await self._request_followups(prompt)
+
+    async def _request_followups(self, prompt: str) -> List[str]:
+        """Request follow-up questions for a prompt, returning one per line."""
+        try:
+            response = await self._create_completion(
+                model=self.followup_model,
                 messages=[
                     {"role": "system", "content": "Generate follow-up questions based ONLY on the provided context."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
-                max_tokens=200
+                max_tokens=150
             )
             
             
@@ -400,16 +757,18 @@ class LLMInterface:
 
     def _log_context_usage(self, context: Dict[str, Any], response: Dict[str, Any]) -> None:
         """Log detailed information about context usage."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         try:
             self.logger.info("Context Usage Analysis:")
-            self.logger.info(f"Available context types: {list(context.keys())}")
+            self.logger.info("Available context types: %s", list(context.keys()))
             
-            for context_type, items in context.items():
-                if isinstance(items, list):
-                    self.logger.info(f"{context_type}: {len(items)} items available")
+            counts = {k: len(v) for k, v in context.items() if isinstance(v, list)}
+            for context_type, count in counts.items():
+                self.logger.info("%s: %d items available", context_type, count)
                     
-            self.logger.info(f"Response length: {len(response['answer'])}")
-            self.logger.info(f"Sources cited: {len(response.get('sources', []))}")
+            self.logger.info("Response length: %d", len(response['answer']))
+            self.logger.info("Sources cited: %d", len(response.get('sources', [])))
             
         except Exception as e:
             self.logger.error(f"Error logging context usage: {e}")
\ No newline at end of file
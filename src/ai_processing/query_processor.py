@@ -1,11 +1,16 @@
 # src/ai_processing/query_processor.py
 from typing import Dict, List, Optional, Any
+from functools import lru_cache
+import copy
 import logging
 import re
 
 class QueryProcessor:
     """Process and classify user queries."""
     
+    # Words never reported as the query's specific term
+    _common_words = frozenset({'how', 'what', 'the', 'for', 'and', 'show', 'me', 'is', 'are', 'this'})
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         
@@ -16,9 +21,38 @@ class QueryProcessor:
             'code': r'(implementation|code|source|how does it work|internal|show|example)',
             'documentation': r'(documentation|explain|what is|purpose|guide|tutorial|how to)'
         }
+        
+        # Precompiled patterns for classification and entity extraction
+        self._type_res = {qtype: re.compile(pattern) for qtype, pattern in self.patterns.items()}
+        self._question_re = re.compile(r'^(what|how|why|when|where|which|can|does)')
+        self._setup_re = re.compile(r'(setup|install|configure|requirement)')
+        self._code_re = re.compile(r'(file|code|implementation|show|content)')
+        
+        self._func_re = re.compile(r'\b\w+(?:_\w+)*\(\)?')
+        self._env_re = re.compile(r'\b[A-Z][A-Z_]+\b')
+        self._path_re = re.compile(r'\b[\w/]+\.(py|json|yml|yaml|md|txt)\b')
+        self._quoted_re = re.compile(r'["\'](.*?)["\']')
+        self._term_re = re.compile(r'\b([a-zA-Z_]\w{2,})\b')
+        
+        self._intent_res = {
+            'is_how_to': re.compile(r'how (to|do|can|should)'),
+            'is_what_is': re.compile(r'what (is|are|does)'),
+            'is_why': re.compile(r'why'),
+            'is_comparison': re.compile(r'(compare|difference|vs|versus)'),
+            'needs_example': re.compile(r'(example|sample|show)'),
+            'is_error': re.compile(r'(error|bug|issue|problem|fail)')
+        }
+        
+        # Processing is a pure function of the query string, so memoize it
+        self._process_cached = lru_cache(maxsize=2048)(self._process_uncached)
 
     def process_query(self, query: str) -> Dict[str, Any]:
         """Process and classify the user query."""
+        # Copy so callers can't mutate the cached result
+        return copy.deepcopy(self._process_cached(query))
+
+    def _process_uncached(self, query: str) -> Dict[str, Any]:
+        """Classify the query and extract its entities."""
         try:
             query_type = self._classify_query(query)
             entities = self._extract_entities(query)
@@ -43,20 +77,20 @@ class QueryProcessor:
         query_types = set()  # Use set to avoid duplicates
         
         # Check each pattern
-        for qtype, pattern in self.patterns.items():
-            if re.search(pattern, query_lower):
+        for qtype, pattern in self._type_res.items():
+            if pattern.search(query_lower):
                 query_types.add(qtype)
         
         # Add documentation type for questions
-        if re.search(r'^(what|how|why|when|where|which|can|does)', query_lower):
+        if self._question_re.search(query_lower):
             query_types.add('documentation')
         
         # If looking for setup/installation
-        if re.search(r'(setup|install|configure|requirement)', query_lower):
+        if self._setup_re.search(query_lower):
             query_types.add('setup')
         
         # If asking about specific code
-        if re.search(r'(file|code|implementation|show|content)', query_lower):
+        if self._code_re.search(query_lower):
             query_types.add('code')
         
         return list(query_types) if query_types else ['documentation']
@@ -71,31 +105,31 @@ class QueryProcessor:
         }
         
         # Extract function names
-        function_match = re.search(r'\b\w+(?:_\w+)*\(\)?', query)
+        function_match = self._func_re.search(query)
         if function_match:
             entities['function_name'] = function_match.group().rstrip('()')
         
         # Extract environment variables
-        env_match = re.search(r'\b[A-Z][A-Z_]+\b', query)
+        env_match = self._env_re.search(query)
         if env_match:
             entities['variable_name'] = env_match.group()
         
         # Extract file paths
-        path_match = re.search(r'\b[\w/]+\.(py|json|yml|yaml|md|txt)\b', query)
+        path_match = self._path_re.search(query)
         if path_match:
             entities['file_path'] = path_match.group()
         
         # Extract specific terms
-        quoted_terms = re.findall(r'["\'](.*?)["\']', query)
+        quoted_terms = self._quoted_re.findall(query)
         if quoted_terms:
             entities['specific_term'] = quoted_terms[0]
         else:
-            significant_terms = re.findall(r'\b([a-zA-Z_]\w{2,})\b', query)
-            if significant_terms:
-                common_words = {'how', 'what', 'the', 'for', 'and', 'show', 'me', 'is', 'are', 'this'}
-                filtered_terms = [term for term in significant_terms if term.lower() not in common_words]
-                if filtered_terms:
-                    entities['specific_term'] = filtered_terms[0]
+            # First significant term that isn't a common word
+            common_words = self._common_words
+            entities['specific_term'] = next(
+                (m.group(1) for m in self._term_re.finditer(query) if m.group(1).lower() not in common_words),
+                None
+            )
         
         return entities
 
@@ -118,13 +152,10 @@ class QueryProcessor:
 
     def analyze_query_intent(self, query: str) -> Dict[str, bool]:
         """Analyze the intent behind the query."""
+        query_lower = query.lower()
         return {
-            'is_how_to': bool(re.search(r'how (to|do|can|should)', query.lower())),
-            'is_what_is': bool(re.search(r'what (is|are|does)', query.lower())),
-            'is_why': bool(re.search(r'why', query.lower())),
-            'is_comparison': bool(re.search(r'(compare|difference|vs|versus)', query.lower())),
-            'needs_example': bool(re.search(r'(example|sample|show)', query.lower())),
-            'is_error': bool(re.search(r'(error|bug|issue|problem|fail)', query.lower()))
+            intent: bool(pattern.search(query_lower))
+            for intent, pattern in self._intent_res.items()
         }
 
     def get_suggested_queries(self, query: str, query_type: List[str]) -> List[str]:
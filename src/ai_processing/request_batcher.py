@@ -0,0 +1,151 @@
+# src/ai_processing/request_batcher.py
+
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Tuple
+import asyncio
+import logging
+import json
+
+# Upper bound on completion tokens for a combined request
+MAX_BATCH_TOKENS = 4096
+
+
+class AsyncBatcher:
+    """Coalesce concurrent chat completion requests into a single API call.
+
+    Requests that share a system prompt and arrive within ``max_wait_ms`` of
+    each other (up to ``batch_size``) are sent as one completion whose user
+    message enumerates every prompt, and the model is asked to return the
+    answers as a JSON array. A batch that cannot be parsed back into one
+    answer per request falls back to individual calls.
+    """
+
+    def __init__(
+        self,
+        create_completion: Callable[..., Awaitable[Any]],
+        model: str,
+        batch_size: int = 8,
+        max_wait_ms: int = 25,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.create_completion = create_completion
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+
+        # The queue and worker belong to the event loop that created them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._dispatches = set()
+
+    async def submit(self, messages: List[Dict[str, str]]) -> Tuple[str, Optional[str], Optional[str]]:
+        """Queue a ``[system, user]`` message pair; returns ``(answer, model, finish_reason)``."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        await self._queue.put((messages, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Collect queued requests into batches and dispatch them."""
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+            while len(batch) < self.batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Only requests with the same system prompt can share a completion
+            groups: Dict[str, List[Tuple[List[Dict[str, str]], asyncio.Future]]] = {}
+            for messages, future in batch:
+                groups.setdefault(messages[0]['content'], []).append((messages, future))
+            for group in groups.values():
+                task = self._loop.create_task(self._dispatch(group))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, group: List[Tuple[List[Dict[str, str]], asyncio.Future]]) -> None:
+        """Send one batch and resolve each request's future."""
+        if len(group) > 1:
+            try:
+                results = await self._complete_batch([messages for messages, _ in group])
+            except Exception as e:
+                self.logger.warning(f"Batched completion failed, sending requests individually: {e}")
+                results = None
+            if results is not None:
+                for (_, future), result in zip(group, results):
+                    if not future.done():
+                        future.set_result(result)
+                return
+
+        await asyncio.gather(*(self._complete_single(messages, future) for messages, future in group))
+
+    async def _complete_single(self, messages: List[Dict[str, str]], future: asyncio.Future) -> None:
+        """Send a single request and resolve its future."""
+        try:
+            response = await self.create_completion(
+                model=self.model,
+                messages=messages,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens
+            )
+            result = (
+                response.choices[0].message.content,
+                response.model,
+                response.choices[0].finish_reason
+            )
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+    async def _complete_batch(
+        self,
+        batch: List[List[Dict[str, str]]]
+    ) -> Optional[List[Tuple[str, Optional[str], Optional[str]]]]:
+        """Answer several prompts in one completion, or return None if the reply is unusable."""
+        system_prompt = batch[0][0]['content'] + f"""
+
+        BATCHED REQUEST:
+        The user message contains {len(batch)} independent requests labelled Q1 to Q{len(batch)}.
+        Answer each one separately, using only the context given within that request.
+        Reply with a JSON object of the form {{"answers": ["answer to Q1", "answer to Q2", ...]}}."""
+        user_prompt = "\n\n".join(
+            f"Q{idx}:\n{messages[-1]['content']}" for idx, messages in enumerate(batch, 1)
+        )
+
+        response = await self.create_completion(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=self.temperature,
+            max_tokens=min(self.max_tokens * len(batch), MAX_BATCH_TOKENS),
+            response_format={"type": "json_object"}
+        )
+
+        try:
+            answers = json.loads(response.choices[0].message.content)['answers']
+        except (ValueError, KeyError, TypeError):
+            return None
+        if not isinstance(answers, list) or len(answers) != len(batch):
+            return None
+
+        finish_reason = response.choices[0].finish_reason
+        return [(str(answer), response.model, finish_reason) for answer in answers]
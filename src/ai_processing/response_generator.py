@@ -2,7 +2,12 @@
 from typing import Dict, List, Any
 import logging
 import re
-import json
+import orjson
+
+_NEWLINE_RE = re.compile(r'\n{3,}')
+_FENCE_RE = re.compile(r'```(?!python|bash|json|yaml)')
+_CODEBLOCK_RE = re.compile(r'```(?:python)?\n(.*?)\n```', re.DOTALL)
+_EXAMPLE_RE = re.compile(r'Example:?\s*```(?:python)?\n(.*?)\n```', re.DOTALL)
 
 class ResponseGenerator:
     """Generate final responses for user queries."""
@@ -47,14 +52,13 @@ class ResponseGenerator:
 
     def _format_answer(self, answer: str) -> str:
         """Format the answer for better readability."""
-        # Remove excessive newlines
-        answer = re.sub(r'\n{3,}', '\n\n', answer)
+        # Remove excessive newlines; substring checks skip the regex for typical answers
+        if '\n\n\n' in answer:
+            answer = _NEWLINE_RE.sub('\n\n', answer)
         
         # Ensure code blocks are properly formatted
-        answer = re.sub(r'```(?!python|bash|json|yaml)', '```python', answer)
-        
-        # Format inline code
-        answer = re.sub(r'`([^`]+)`', r'`\1`', answer)
+        if '```' in answer:
+            answer = _FENCE_RE.sub('```python', answer)
         
         return answer
 
@@ -70,10 +74,7 @@ class ResponseGenerator:
 
     def _extract_code_snippets(self, answer: str) -> List[str]:
         """Extract code snippets from the answer."""
-        code_blocks = []
-        for match in re.finditer(r'```(?:python)?\n(.*?)\n```', answer, re.DOTALL):
-            code_blocks.append(match.group(1).strip())
-        return code_blocks
+        return [match.group(1).strip() for match in _CODEBLOCK_RE.finditer(answer)]
 
     def _extract_api_details(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Extract API details from context."""
@@ -109,10 +110,18 @@ class ResponseGenerator:
         examples = []
         docstring = item.get('docstring', '')
         if docstring:
-            matches = re.finditer(r'Example:?\s*```(?:python)?\n(.*?)\n```', docstring, re.DOTALL)
+            matches = _EXAMPLE_RE.finditer(docstring)
             examples.extend(match.group(1).strip() for match in matches)
         return examples
 
+    def to_json(self, response: Dict[str, Any]) -> bytes:
+        """Serialize a response to JSON bytes."""
+        return orjson.dumps(
+            response,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
     def format_for_display(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """Format the response for display in the UI."""
         display_response = {
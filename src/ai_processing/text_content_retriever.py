@@ -1,10 +1,13 @@
 # src/ai_processing/text_content_retriever.py
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from functools import cached_property, lru_cache
 import chromadb
 from chromadb.utils import embedding_functions
 import os
+import threading
+from ._scoring import filter_scores
 
 class TextContentRetriever:
     """Retrieve content from markdown and text files stored in ChromaDB."""
@@ -12,25 +15,48 @@ class TextContentRetriever:
     def __init__(self, persist_directory: str):
         self.logger = logging.getLogger(__name__)
         self.persist_directory = persist_directory
+        self.client = None
+        self.embedding_function = None
         
-        # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(path=persist_directory)
+        # The client, embedding function and collection are created on first use
+        self._init_lock = threading.Lock()
         
-        # Initialize OpenAI embedding function
-        self.embedding_function = embedding_functions.OpenAIEmbeddingFunction(
-            api_key=os.getenv('OPENAI_API_KEY'),
-            model_name="text-embedding-3-small"
-        )
-        
-        # Get the documentation_text collection
-        try:
-            self.text_collection = self.client.get_collection(
-                name="documentation_text",
-                embedding_function=self.embedding_function
-            )
-        except Exception as e:
-            self.logger.error(f"Error getting documentation_text collection: {e}")
-            self.text_collection = None
+        # Query embeddings cost an API round trip, so reuse them for repeated queries
+        self._embed_cached = lru_cache(maxsize=1024)(self._embed_uncached)
+
+    @cached_property
+    def text_collection(self):
+        """The documentation_text collection, connected on first use; None if unavailable."""
+        with self._init_lock:
+            # Another thread may have connected while this one waited
+            if 'text_collection' in self.__dict__:
+                return self.__dict__['text_collection']
+            try:
+                # Initialize ChromaDB client
+                self.client = chromadb.PersistentClient(path=self.persist_directory)
+                
+                # Initialize OpenAI embedding function
+                self.embedding_function = embedding_functions.OpenAIEmbeddingFunction(
+                    api_key=os.getenv('OPENAI_API_KEY'),
+                    model_name="text-embedding-3-small"
+                )
+                
+                # Get the documentation_text collection
+                return self.client.get_collection(
+                    name="documentation_text",
+                    embedding_function=self.embedding_function
+                )
+            except Exception as e:
+                self.logger.error(f"Error getting documentation_text collection: {e}")
+                return None
+
+    def _embed(self, text: str) -> List[float]:
+        """Embed a query, treating whitespace-only differences as the same query."""
+        return list(self._embed_cached(' '.join(text.split())))
+
+    def _embed_uncached(self, text: str) -> Tuple[float, ...]:
+        """Embed a single query text."""
+        return tuple(self.embedding_function([text])[0])
 
     def get_text_content(self, query: str) -> List[Dict[str, Any]]:
         """Retrieve relevant text content for a query."""
@@ -40,7 +66,7 @@ class TextContentRetriever:
         try:
             # Search in the text collection
             results = self.text_collection.query(
-                query_texts=[query],
+                query_embeddings=[self._embed(query)],
                 n_results=5,
                 include=['documents', 'metadatas', 'distances']
             )
@@ -48,23 +74,19 @@ class TextContentRetriever:
             if not results['documents'][0]:
                 return []
 
-            # Format results
-            formatted_results = []
-            for doc, metadata, distance in zip(
-                results['documents'][0],
-                results['metadatas'][0],
-                results['distances'][0]
-            ):
-                relevance_score = 1.0 - min(distance, 1.0)
-                if relevance_score > 0.2:  # Minimum relevance threshold
-                    formatted_results.append({
-                        'content': doc,
-                        'metadata': metadata,
-                        'type': 'documentation',
-                        'relevance_score': relevance_score
-                    })
-
-            return formatted_results
+            # Format results above the minimum relevance threshold
+            docs = results['documents'][0]
+            metadatas = results['metadatas'][0]
+            keep, scores = filter_scores(results['distances'][0], 0.2)
+            return [
+                {
+                    'content': docs[i],
+                    'metadata': metadatas[i],
+                    'type': 'documentation',
+                    'relevance_score': float(scores[i])
+                }
+                for i in keep
+            ]
 
         except Exception as e:
             self.logger.error(f"Error retrieving text content: {e}")
@@ -78,7 +100,7 @@ class TextContentRetriever:
         try:
             # Search for content from specific file
             results = self.text_collection.query(
-                query_texts=[filename],
+                query_embeddings=[self._embed(filename)],
                 n_results=10,
                 where={"file_name": filename}
             )
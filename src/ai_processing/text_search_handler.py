@@ -2,32 +2,64 @@
 
 from typing import Dict, Any, Optional
 import logging
+import re
 from .text_content_retriever import TextContentRetriever
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 class TextSearchHandler:
     """Handle text content searching and LLM integration."""
     
+    # Files that can be answered directly, with the keywords that select them,
+    # in priority order
+    SPECIFIC_FILES = {
+        'requirements.txt': ['requirement', 'dependency', 'dependencies', 'package'],
+        'README.md': ['readme', 'instruction', 'setup', 'overview'],
+        'CHANGELOG.md': ['changelog', 'change', 'update', 'version'],
+        'model-card.md': ['model', 'card', 'capability', 'specification']
+    }
+    
     def __init__(self, persist_directory: str):
         self.logger = logging.getLogger(__name__)
         self.text_retriever = TextContentRetriever(persist_directory)
+        
+        # Match every keyword in a single pass over the query, with an
+        # Aho-Corasick automaton when available and one alternation regex otherwise
+        self._keyword_automaton = None
+        self._keyword_re = None
+        self._files = list(self.SPECIFIC_FILES)
+        if ahocorasick is not None:
+            self._keyword_automaton = ahocorasick.Automaton()
+            for priority, (file, keywords) in enumerate(self.SPECIFIC_FILES.items()):
+                for keyword in keywords:
+                    existing = self._keyword_automaton.get(keyword, None)
+                    if existing is None or priority < existing[0]:
+                        self._keyword_automaton.add_word(keyword, (priority, file))
+            self._keyword_automaton.make_automaton()
+        else:
+            # One named group per file; the lookahead also reports overlapping keywords
+            self._keyword_re = re.compile('(?=(?:' + '|'.join(
+                f"(?P<f{priority}>{'|'.join(map(re.escape, keywords))})"
+                for priority, keywords in enumerate(self.SPECIFIC_FILES.values())
+            ) + '))')
+
+    def _match_specific_file(self, query: str) -> Optional[str]:
+        """Return the highest-priority file whose keywords occur in the query."""
+        query_lower = query.lower()
+        if self._keyword_automaton is not None:
+            match = min((value for _, value in self._keyword_automaton.iter(query_lower)), default=None)
+            return match[1] if match else None
+        priority = min((int(m.lastgroup[1:]) for m in self._keyword_re.finditer(query_lower)), default=None)
+        return self._files[priority] if priority is not None else None
 
     async def handle_text_query(self, query: str, llm_interface: Any) -> Optional[Dict[str, Any]]:
         """Handle queries that might need text content."""
         try:
-            # Check for specific file mentions
-            specific_files = {
-                'requirements.txt': ['requirement', 'dependency', 'dependencies', 'package'],
-                'README.md': ['readme', 'instruction', 'setup', 'overview'],
-                'CHANGELOG.md': ['changelog', 'change', 'update', 'version'],
-                'model-card.md': ['model', 'card', 'capability', 'specification']
-            }
-
             # Check if query is about a specific file
-            target_file = None
-            for file, keywords in specific_files.items():
-                if any(keyword in query.lower() for keyword in keywords):
-                    target_file = file
-                    break
+            target_file = self._match_specific_file(query)
 
             # Get content
             if target_file:
@@ -1,7 +1,11 @@
 # src/data_ingestion/__init__.py
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import ast
 import logging
+import multiprocessing
+import os
 import git
 from .repo_crawler import RepoCrawler
 from .code_parser import CodeParser  # This import should now work
@@ -9,6 +13,67 @@ from .extractors.api_extractor import APIExtractor
 from .extractors.env_extractor import EnvExtractor
 from .extractors.doc_extractor import DocExtractor
 from .content_analyzer import ContentAnalyzer
+from .text_index import TextIndex
+
+# Parser and extractors owned by each ingestion worker process
+_worker_components = None
+
+# Upper bound on files sent to a worker per task, amortizing pickling and IPC
+MAX_CHUNKSIZE = 32
+
+
+def _init_worker() -> None:
+    """Build the parser and extractors once per worker process."""
+    global _worker_components
+    _worker_components = (CodeParser(cache_path=None), DocExtractor(), APIExtractor(), EnvExtractor())
+
+
+def _process_one(
+    full_path: Path,
+    parse: bool
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], List[Dict], List[Dict]]:
+    """Extract documentation, code structure, APIs and env vars from one file.
+
+    Code structure and APIs come from the AST, so they are only extracted
+    from Python files. The file is read and parsed once, and its text, AST
+    and line index are shared by all extractors.
+    """
+    parser, doc_extractor, api_extractor, env_extractor = _worker_components
+    is_python = full_path.suffix == '.py'
+    try:
+        with open(full_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except (OSError, UnicodeDecodeError):
+        # Let each extractor read the file itself and report the error
+        content = None
+    tree = None
+    index = None
+    if is_python and content is not None:
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            # Let each extractor parse the file itself and report the error
+            pass
+        if parse:
+            # The code parser always needs line lookups; env var context reuses them
+            index = TextIndex(content)
+    doc_result = doc_extractor.extract_documentation(full_path, content, tree)
+    if parse and is_python:
+        code_structure = parser.parse_file(full_path) if content is None else parser.parse_text(full_path, content, tree, index)
+    else:
+        code_structure = None
+    apis = api_extractor.extract_apis(full_path, content, tree) if is_python else []
+    env_vars = env_extractor.extract_env_vars(full_path, content, index)
+    return doc_result, code_structure, apis, env_vars
+
+
+def _process_one_safely(full_path: Path, parse: bool):
+    """Run ``_process_one``, returning any exception so one file can't abort a chunk."""
+    try:
+        return _process_one(full_path, parse)
+    except Exception as e:
+        return e
+
 
 class DataIngestion:
     """Main class for handling data ingestion from repositories."""
@@ -56,50 +121,83 @@ class DataIngestion:
     def process_repository(self) -> dict:
         """Process the entire repository and extract all relevant information."""
         try:
-            results = {
-                'files': [],
-                'apis': [],
-                'env_vars': [],
-                'documentation': []
-            }
+            files = []
+            apis_found = []
+            env_vars_found = []
+            documentation = []
 
             # Get all Python files
             python_files = self.crawler.get_file_list(['.py','.md', '.txt'])
             
-            for file_path in python_files:
-                full_path = self.local_path / file_path
+            # Files are independent and CPU-bound, so process them across cores.
+            # Unchanged files reuse the parse cache held by this process.
+            full_paths = [self.local_path / file_path for file_path in python_files]
+            cached_structures = [
+                self.parser.get_cached(full_path) if full_path.suffix == '.py' else None
+                for full_path in full_paths
+            ]
+            workers = os.cpu_count() or 1
+            # Send files in chunks, but keep several chunks per worker for load balancing
+            chunksize = max(1, min(MAX_CHUNKSIZE, len(full_paths) // (workers * 4)))
+            # Workers rebuild their own state, so don't fork: ingestion can run alongside
+            # other threads (text processing, HTTP clients, logging) whose locks a fork would copy
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(start_method),
+                initializer=_init_worker
+            ) as executor:
+                results = executor.map(
+                    _process_one_safely,
+                    full_paths,
+                    [cached is None for cached in cached_structures],
+                    chunksize=chunksize
+                )
                 
-                try:
-                    # Extract documentation first
-                    doc_result = self.doc_extractor.extract_documentation(full_path)
-                    if doc_result and 'content' in doc_result:
-                        results['documentation'].append(doc_result)
-
-                    # Parse code structure
-                    code_structure = self.parser.parse_file(full_path)
-                    if code_structure:
-                        results['files'].append({
-                            'path': str(file_path),
-                            'structure': code_structure,
-                            'content': doc_result.get('content', {})
-                        })
-
-                    # Extract APIs
-                    apis = self.api_extractor.extract_apis(full_path)
-                    if apis:
-                        results['apis'].extend(apis)
-
-                    # Extract environment variables
-                    env_vars = self.env_extractor.extract_env_vars(full_path)
-                    if env_vars:
-                        results['env_vars'].extend(env_vars)
-
-                except Exception as e:
-                    self.logger.error(f"Error processing file {file_path}: {e}")
-                    continue
-
-            self.logger.info(f"Processed {len(results['files'])} files successfully")
-            return results
+                for file_path, full_path, cached_structure, result in zip(
+                    python_files, full_paths, cached_structures, results
+                ):
+                    try:
+                        if isinstance(result, Exception):
+                            raise result
+                        doc_result, code_structure, apis, env_vars = result
+                        
+                        # Extract documentation first
+                        if doc_result and 'content' in doc_result:
+                            documentation.append(doc_result)
+
+                        # Parse code structure
+                        if cached_structure is not None:
+                            code_structure = cached_structure
+                        elif code_structure:
+                            self.parser.add_to_cache(full_path, code_structure)
+                        if code_structure:
+                            files.append({
+                                'path': str(file_path),
+                                'structure': code_structure,
+                                'content': doc_result.get('content', {})
+                            })
+
+                        # Extract APIs
+                        if apis:
+                            apis_found.extend(apis)
+
+                        # Extract environment variables
+                        if env_vars:
+                            env_vars_found.extend(env_vars)
+
+                    except Exception as e:
+                        self.logger.error(f"Error processing file {file_path}: {e}")
+                        continue
+
+            self.parser.save_cache()
+            self.logger.info(f"Processed {len(files)} files successfully")
+            return {
+                'files': files,
+                'apis': apis_found,
+                'env_vars': env_vars_found,
+                'documentation': documentation
+            }
             
         except Exception as e:
             self.logger.error(f"Error processing repository: {e}")
@@ -1,130 +1,272 @@
 # src/data_ingestion/code_parser.py
 import ast
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 import logging
+import mmap
+import os
+import pickle
+import sys
 import tokenize
 import io
+from .text_index import TextIndex
+
+# Parsed files persist here between runs, keyed by path and validated by mtime and size
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'whisper_assistant' / 'ast_cache.pkl'
+
+# Bump when the shape of parse results changes so stale cache files are discarded
+_CACHE_FORMAT = 5
+
+
+def _intern_small(value: Optional[str]) -> Optional[str]:
+    """Intern short strings, which repeat across functions and files."""
+    if isinstance(value, str) and len(value) < 64:
+        return sys.intern(value)
+    return value
+
+
+class _Collector(ast.NodeVisitor):
+    """Collect functions, classes and imports in a single traversal of a module."""
+
+    def __init__(self, parser: 'CodeParser', index: TextIndex):
+        self.parser = parser
+        self.index = index
+        self.funcs: List[Dict[str, Any]] = []
+        self.classes: List[Dict[str, Any]] = []
+        self.imports: List[str] = []
+        self._scope_depth = 0
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        # Only module-scope functions; methods are reported with their class
+        if not self._scope_depth:
+            self.funcs.append(self.parser._function_info(self.index, node))
+        self._visit_nested(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.classes.append(self.parser._class_info(self.index, node))
+        self._visit_nested(node)
+
+    def _visit_nested(self, node: ast.AST) -> None:
+        # Keep descending for nested classes and imports
+        self._scope_depth += 1
+        self.generic_visit(node)
+        self._scope_depth -= 1
+
+    def visit_Import(self, node: ast.Import) -> None:
+        self.imports.extend(n.name for n in node.names)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = node.module or ''
+        self.imports.extend(f"{module}.{n.name}" for n in node.names)
+
 
 class CodeParser:  # Keep the original name for backward compatibility
     """Enhanced code parser with improved extraction capabilities."""
     
-    def __init__(self):
+    def __init__(self, cache_path: Optional[Path] = DEFAULT_CACHE_PATH):
         self.logger = logging.getLogger(__name__)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = self._load_cache()
+        self._cache_dirty = False
+        # Equal docstrings share one string object
+        self._docstr_pool: Dict[str, str] = {}
 
     def parse_file(self, file_path: Path) -> Dict[str, Any]:
         """Parse a Python file and extract comprehensive information."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            cached = self.get_cached(file_path)
+            if cached is not None:
+                return cached
             
-            # Store raw content for context
-            raw_content = content
+            st = os.stat(file_path)
+            version = (st.st_mtime_ns, st.st_size)
+            content = self._read_source(file_path, st.st_size)
             
+            result = self.parse_text(file_path, content)
+            if result:
+                self._cache[str(file_path)] = (version, result)
+                self._cache_dirty = True
+            return result
+        except Exception as e:
+            self.logger.error(f"Error parsing file {file_path}: {e}")
+            return {}
+
+    def parse_text(
+        self,
+        file_path: Path,
+        content: str,
+        tree: Optional[ast.Module] = None,
+        index: Optional[TextIndex] = None
+    ) -> Dict[str, Any]:
+        """Parse already-read Python source; ``file_path`` is only recorded.
+
+        ``tree`` and ``index`` are the source's AST and line index if the
+        caller has already built them.
+        """
+        try:
             # Parse AST
-            tree = ast.parse(content)
+            if tree is None:
+                tree = ast.parse(content)
+            if index is None:
+                index = TextIndex(content)
+            
+            collector = _Collector(self, index)
+            collector.visit(tree)
+            functions = collector.funcs
+            classes = collector.classes
+            imports = collector.imports
+            docstring = self._get_docstring(tree)
             
             return {
-                'raw_content': raw_content,
                 'file_path': str(file_path),
-                'functions': self._extract_functions(tree),
-                'classes': self._extract_classes(tree),
-                'imports': self._extract_imports(tree),
-                'docstring': ast.get_docstring(tree),
-                'comments': self._extract_comments(content),
-                'structure': self._extract_structure(tree)
+                'functions': functions,
+                'classes': classes,
+                'imports': imports,
+                'docstring': docstring,
+                'comments': self._extract_comments(content, index),
+                'structure': {
+                    'functions': functions,
+                    'classes': classes,
+                    'imports': imports,
+                    'module_docstring': docstring
+                }
             }
         except Exception as e:
             self.logger.error(f"Error parsing file {file_path}: {e}")
             return {}
 
-    def _extract_functions(self, tree: ast.AST) -> List[Dict[str, Any]]:
-        """Extract function definitions with enhanced context."""
-        functions = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                try:
-                    source_lines = ast.get_source_segment(tree.body[0], node)
-                except:
-                    source_lines = None
-                    
-                functions.append({
-                    'name': node.name,
-                    'docstring': ast.get_docstring(node),
-                    'args': [arg.arg for arg in node.args.args],
-                    'returns': self._get_return_annotation(node),
-                    'body': source_lines,
-                    'decorators': [ast.unparse(d) for d in node.decorator_list],
-                    'line_number': node.lineno,
-                    'context': self._get_function_context(node)
-                })
-        return functions
-
-    def _extract_classes(self, tree: ast.AST) -> List[Dict[str, Any]]:
-        """Extract class definitions with enhanced context."""
-        classes = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                classes.append({
-                    'name': node.name,
-                    'docstring': ast.get_docstring(node),
-                    'methods': self._extract_methods(node),
-                    'bases': [ast.unparse(base) for base in node.bases],
-                    'decorators': [ast.unparse(d) for d in node.decorator_list],
-                    'attributes': self._extract_class_attributes(node)
-                })
-        return classes
-
-    def _extract_methods(self, class_node: ast.ClassDef) -> List[Dict[str, Any]]:
+    def _read_source(self, file_path: Path, size: int) -> str:
+        """Read a source file through a memory map, decoding it in one step."""
+        if not size:
+            return ''
+        with open(file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    content = str(view, 'utf-8')
+        # Match the newline translation of text-mode reads
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+
+    def get_cached(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Return the cached parse of a file if it is unchanged on disk."""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        cached = self._cache.get(str(file_path))
+        if cached is not None and cached[0] == (st.st_mtime_ns, st.st_size):
+            return cached[1]
+        return None
+
+    def add_to_cache(self, file_path: Path, result: Dict[str, Any]) -> None:
+        """Record a parse produced elsewhere, e.g. in a worker process."""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return
+        self._cache[str(file_path)] = ((st.st_mtime_ns, st.st_size), result)
+        self._cache_dirty = True
+
+    def _load_cache(self) -> Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]]:
+        """Load previously parsed files from the on-disk cache."""
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cache_format, cache = pickle.load(f)
+            return cache if cache_format == _CACHE_FORMAT and isinstance(cache, dict) else {}
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable parse cache {self.cache_path}: {e}")
+            return {}
+
+    def save_cache(self) -> bool:
+        """Persist parsed files to the on-disk cache if anything changed."""
+        if self.cache_path is None or not self._cache_dirty:
+            return True
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((_CACHE_FORMAT, self._cache), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+            self._cache_dirty = False
+            return True
+        except Exception as e:
+            self.logger.error(f"Error saving parse cache: {e}")
+            return False
+
+    def _function_info(self, index: TextIndex, node: ast.FunctionDef) -> Dict[str, Any]:
+        """Describe a function definition with enhanced context."""
+        return {
+            'name': node.name,
+            'docstring': self._get_docstring(node),
+            'args': [arg.arg for arg in node.args.args],
+            'returns': self._get_return_annotation(node),
+            'body': self._source_lines(index, node),
+            'decorators': [_intern_small(ast.unparse(d)) for d in node.decorator_list],
+            'line_number': node.lineno,
+            'context': self._get_function_context(node)
+        }
+
+    def _class_info(self, index: TextIndex, node: ast.ClassDef) -> Dict[str, Any]:
+        """Describe a class definition with enhanced context."""
+        return {
+            'name': node.name,
+            'docstring': self._get_docstring(node),
+            'methods': self._extract_methods(index, node),
+            'bases': [_intern_small(ast.unparse(base)) for base in node.bases],
+            'decorators': [_intern_small(ast.unparse(d)) for d in node.decorator_list],
+            'attributes': self._extract_class_attributes(node)
+        }
+
+    def _extract_methods(self, index: TextIndex, class_node: ast.ClassDef) -> List[Dict[str, Any]]:
         """Extract methods from a class with implementation details."""
-        methods = []
-        for node in ast.walk(class_node):
-            if isinstance(node, ast.FunctionDef):
-                try:
-                    source_lines = ast.get_source_segment(class_node, node)
-                except:
-                    source_lines = None
-                    
-                methods.append({
-                    'name': node.name,
-                    'docstring': ast.get_docstring(node),
-                    'args': [arg.arg for arg in node.args.args],
-                    'returns': self._get_return_annotation(node),
-                    'body': source_lines,
-                    'decorators': [ast.unparse(d) for d in node.decorator_list]
-                })
-        return methods
-
-    def _extract_comments(self, content: str) -> List[Dict[str, str]]:
+        return [
+            {
+                'name': node.name,
+                'docstring': self._get_docstring(node),
+                'args': [arg.arg for arg in node.args.args],
+                'returns': self._get_return_annotation(node),
+                'body': self._source_lines(index, node),
+                'decorators': [_intern_small(ast.unparse(d)) for d in node.decorator_list]
+            }
+            for node in class_node.body
+            if isinstance(node, ast.FunctionDef)
+        ]
+
+    def _source_lines(self, index: TextIndex, node: ast.AST) -> str:
+        """Source text of the lines a node spans, sliced from the file's line index."""
+        return index.span(node.lineno, node.end_lineno)
+
+    def _extract_comments(self, content: str, index: TextIndex) -> List[Dict[str, str]]:
         """Extract comments with their context."""
         comments = []
+        if '#' not in content:
+            return comments
         try:
-            for token in tokenize.generate_tokens(io.StringIO(content).readline):
+            for token in tokenize.tokenize(io.BytesIO(content.encode('utf-8')).readline):
                 if token.type == tokenize.COMMENT:
                     comments.append({
                         'text': token.string.lstrip('#').strip(),
                         'line': token.start[0],
-                        'context': self._get_comment_context(content, token.start[0])
+                        'context': self._get_comment_context(index, token.start[0])
                     })
         except Exception as e:
             self.logger.error(f"Error extracting comments: {e}")
         return comments
 
-    def _extract_imports(self, tree: ast.AST) -> List[str]:
-        """Extract import statements with full context."""
-        imports = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                imports.extend(n.name for n in node.names)
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module or ''
-                imports.extend(f"{module}.{n.name}" for n in node.names)
-        return imports
+    def _get_docstring(self, node: ast.AST) -> Optional[str]:
+        """Get a node's docstring, shared with any equal docstring seen before."""
+        docstring = ast.get_docstring(node)
+        if docstring is None:
+            return None
+        return self._docstr_pool.setdefault(docstring, docstring)
 
     def _get_return_annotation(self, node: ast.FunctionDef) -> str:
         """Get the return type annotation if it exists."""
         if node.returns:
-            return ast.unparse(node.returns)
+            return _intern_small(ast.unparse(node.returns))
         return None
 
     def _get_function_context(self, node: ast.FunctionDef) -> Dict[str, Any]:
@@ -136,30 +278,18 @@ class CodeParser:  # Keep the original name for backward compatibility
             'is_method': isinstance(node.parent, ast.ClassDef) if hasattr(node, 'parent') else False
         }
 
-    def _get_comment_context(self, content: str, line_number: int, context_lines: int = 2) -> str:
+    def _get_comment_context(self, index: TextIndex, line_number: int, context_lines: int = 2) -> str:
         """Get context around a comment."""
-        lines = content.split('\n')
-        start = max(0, line_number - context_lines - 1)
-        end = min(len(lines), line_number + context_lines)
-        return '\n'.join(lines[start:end])
+        return index.window(line_number, context_lines)
 
     def _extract_class_attributes(self, node: ast.ClassDef) -> List[Dict[str, Any]]:
         """Extract class attributes including type annotations."""
-        attributes = []
-        for body_item in node.body:
-            if isinstance(body_item, ast.AnnAssign):
-                attributes.append({
-                    'name': ast.unparse(body_item.target),
-                    'type': ast.unparse(body_item.annotation) if body_item.annotation else None,
-                    'value': ast.unparse(body_item.value) if body_item.value else None
-                })
-        return attributes
-
-    def _extract_structure(self, tree: ast.AST) -> Dict[str, Any]:
-        """Extract the overall structure of the code."""
-        return {
-            'functions': self._extract_functions(tree),
-            'classes': self._extract_classes(tree),
-            'imports': self._extract_imports(tree),
-            'module_docstring': ast.get_docstring(tree)
-        }
\ No newline at end of file
+        return [
+            {
+                'name': _intern_small(ast.unparse(body_item.target)),
+                'type': _intern_small(ast.unparse(body_item.annotation)) if body_item.annotation else None,
+                'value': _intern_small(ast.unparse(body_item.value)) if body_item.value else None
+            }
+            for body_item in node.body
+            if isinstance(body_item, ast.AnnAssign)
+        ]
@@ -1,18 +1,102 @@
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import logging
+import json
+import hashlib
+import orjson
+import re
+from collections import OrderedDict
 from pathlib import Path
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 import asyncio
-from tenacity import retry, stop_after_attempt, wait_exponential
+import httpx
 from datetime import datetime
+from .rate_limiter import TokenBucket
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Analyses generated for every file
+ANALYSIS_TYPES = ['summarize', 'generate_qa', 'extract_concepts']
+
+# Batch API statuses after which a batch will make no further progress
+_BATCH_TERMINAL_STATUSES = {'completed', 'failed', 'expired', 'cancelled'}
+
+# Maximum number of (content hash, analysis type) results kept in the analysis cache
+ANALYSIS_CACHE_SIZE = 4096
+
+# Model used for every analysis, and its context window in tokens
+ANALYSIS_MODEL = "gpt-4o-mini-2024-07-18"
+MODEL_CONTEXT_TOKENS = 128000
+
+# Completion cap per request, and headroom kept free of prompt and completion
+MAX_COMPLETION_TOKENS = 2000
+CONTEXT_MARGIN_TOKENS = 200
+
+# Content above CHUNK_THRESHOLD_TOKENS is analyzed in line-aligned windows of
+# at most CHUNK_TOKENS, whose results are then merged
+CHUNK_THRESHOLD_TOKENS = 12000
+CHUNK_TOKENS = 6000
+
+# Line-start markers that split generated content into Q&A pairs and concepts
+_QUESTION_RE = re.compile(r'^Q:', re.M)
+_CONCEPT_RE = re.compile(r'^##', re.M)
 
 class ContentAnalyzer:
     """Analyzes repository content to generate summaries and Q&A pairs."""
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        use_batch_api: bool = False,
+        batch_poll_interval: float = 30.0,
+        cache_path: Optional[str] = '.analyzer_cache.jsonl'
+    ):
         self.logger = logging.getLogger(__name__)
-        self.client = AsyncOpenAI(api_key=api_key)
+        # The SDK retries connection errors, 429s and 5xx responses itself,
+        # honouring Retry-After, over a pooled keep-alive HTTP client
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            max_retries=5,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=25)
+            )
+        )
+        
+        # Analyses keyed by content hash and analysis type, so duplicate files
+        # and unchanged files on re-runs don't repeat requests
+        self.cache_path = Path(cache_path) if cache_path else None
+        # New analyses are appended to the cache file; it is only rewritten
+        # once superseded and evicted entries make up half of its lines
+        self._cache_file_lines = 0
+        self._unsaved_entries: List[bytes] = []
+        self._content_cache: OrderedDict = self._load_content_cache()
+        # Each key maps to [lock, callers holding or awaiting it]; the entry is
+        # dropped when the count reaches zero, never while a waiter is queued
+        self._analysis_locks: Dict[Tuple[str, str], List] = {}
+        
+        # Submit all analyses as one Batch API job instead of individual requests
+        self.use_batch_api = use_batch_api
+        self.batch_poll_interval = batch_poll_interval
+        
+        # Cap in-flight requests (the semaphore is recreated per event loop) and
+        # pace them against the rate limits reported in response headers
+        self._max_concurrency = max(1, int(os.getenv('OPENAI_MAX_CONC', '20')))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._rate_limiter = TokenBucket()
+        
+        # Token counts fall back to a characters/4 estimate when tiktoken or
+        # its encoding is unavailable
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.encoding_for_model("gpt-4o-mini")
+            except Exception as e:
+                self.logger.warning(f"Could not load tiktoken encoding: {e}")
         
         # Prompts for different analysis tasks
         self.prompts = {
@@ -46,6 +130,11 @@ class ContentAnalyzer:
             - Usage in code
             - Important considerations"""
         }
+        
+        # Merges the summaries of a large file's windows into one
+        self.merge_prompt = """The following are summaries of consecutive sections of one Python file.
+            Merge them into a single summary of the whole file, keeping the same
+            markdown structure and removing repetition."""
 
     async def analyze_repository(self, repository_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze repository content and generate enhanced context."""
@@ -63,35 +152,29 @@ class ContentAnalyzer:
                 }
             }
 
-            # Process files in batches to avoid rate limits
-            batch_size = 5
-            for i in range(0, len(repository_data['files']), batch_size):
-                batch = repository_data['files'][i:i + batch_size]
-                self.logger.info(f"Processing batch {i//batch_size + 1}, files {i+1} to {min(i+batch_size, len(repository_data['files']))}")
-                
-                # Create tasks for batch
-                tasks = []
-                for file_info in batch:
-                    for analysis_type in ['summarize', 'generate_qa', 'extract_concepts']:
-                        tasks.append(self._analyze_file(file_info, analysis_type))
-                
-                # Process batch
-                batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+            files = repository_data['files']
+            results = None
+            if self.use_batch_api:
+                try:
+                    results = await self._submit_batch(files)
+                except Exception as e:
+                    self.logger.error(f"Batch analysis failed, analyzing files individually: {e}")
+            if results is None:
+                results = await self._analyze_individually(files)
+            
+            # Handle results
+            for result in results:
+                if isinstance(result, Exception):
+                    self.logger.error(f"Analysis error: {str(result)}")
+                    continue
                 
-                # Handle results
-                for result in batch_results:
-                    if isinstance(result, Exception):
-                        self.logger.error(f"Analysis error: {str(result)}")
-                        continue
+                if not isinstance(result, dict) or not result:
+                    continue
                     
-                    if not isinstance(result, dict) or not result:
-                        continue
-                        
-                    self._process_analysis_result(result, analysis_results)
-                
-                # Add small delay between batches
-                await asyncio.sleep(1)
+                self._process_analysis_result(result, analysis_results)
 
+            self._save_content_cache()
+            
             # Generate summary statistics
             analysis_results['stats'] = {
                 'total_summaries': len(analysis_results['file_summaries']),
@@ -106,6 +189,104 @@ class ContentAnalyzer:
             self.logger.error(f"Error analyzing repository: {e}")
             raise
 
+    async def _analyze_individually(self, files: List[Dict[str, Any]]) -> List[Any]:
+        """Analyze files with one request per analysis; failures are returned as exceptions."""
+        self.logger.info(f"Analyzing {len(files)} files individually")
+        return await asyncio.gather(
+            *[self._analyze_file(file_info, analysis_type)
+              for file_info in files
+              for analysis_type in ANALYSIS_TYPES],
+            return_exceptions=True
+        )
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the request concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _submit_batch(self, files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run every (file, analysis type) request as a single Batch API job.
+
+        Polls until the job finishes and returns one result per successful
+        request, in the same shape as ``_analyze_file``.
+        """
+        results = []
+        lines = []
+        # Files too large for a single request are analyzed in windows instead
+        oversized = []
+        # Requests by custom_id, and the files that share each request's content
+        requested: Dict[str, Tuple[str, str]] = {}
+        sharing: Dict[Tuple[str, str], List[str]] = {}
+        for file_info in files:
+            file_path = file_info.get('path', 'unknown')
+            if len(self._split_content(self._file_content(file_info))) > 1:
+                oversized.append(file_info)
+                continue
+            for analysis_type in ANALYSIS_TYPES:
+                key = self._content_key(file_info, analysis_type)
+                cached = self._get_cached_analysis(key)
+                if cached is not None:
+                    results.append(self._build_result(file_path, analysis_type, cached))
+                    continue
+                if key in sharing:
+                    sharing[key].append(file_path)
+                    continue
+                sharing[key] = [file_path]
+                custom_id = f"{file_path}|{analysis_type}"
+                requested[custom_id] = key
+                lines.append(orjson.dumps({
+                    'custom_id': custom_id,
+                    'method': 'POST',
+                    'url': '/v1/chat/completions',
+                    'body': self._build_request(file_path, analysis_type, self._file_content(file_info))
+                }))
+        if oversized:
+            results.extend(await self._analyze_individually(oversized))
+        if not lines:
+            return results
+        
+        batch_file = await self.client.files.create(
+            file=('content_analysis.jsonl', b'\n'.join(lines)),
+            purpose='batch'
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        self.logger.info(f"Submitted analysis batch {batch.id} with {len(lines)} requests")
+        
+        while batch.status not in _BATCH_TERMINAL_STATUSES:
+            await asyncio.sleep(self.batch_poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+        
+        if batch.status != 'completed':
+            raise RuntimeError(f"Analysis batch {batch.id} ended with status {batch.status}")
+        if not batch.output_file_id:
+            raise RuntimeError(f"Analysis batch {batch.id} produced no output")
+        
+        output = await self.client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            file_path, analysis_type = record['custom_id'].rsplit('|', 1)
+            response = record.get('response') or {}
+            if record.get('error') or response.get('status_code') != 200:
+                self.logger.error(f"Error analyzing file {file_path} for {analysis_type}: {record.get('error') or response.get('body')}")
+                continue
+            content = response['body']['choices'][0]['message']['content']
+            key = requested[record['custom_id']]
+            self._store_analysis(key, content)
+            for shared_path in sharing[key]:
+                results.append(self._build_result(shared_path, analysis_type, content))
+        
+        self.logger.info(f"Analysis batch {batch.id} returned {len(results)} results")
+        return results
+
     def _process_analysis_result(self, result: Dict[str, Any], analysis_results: Dict[str, Any]):
         """Process and categorize analysis results."""
         try:
@@ -120,38 +301,198 @@ class ContentAnalyzer:
                 })
                 
             elif result['type'] == 'generate_qa':
-                qa_pairs = self._parse_qa_pairs(result['content'])
-                for qa in qa_pairs:
-                    qa['file_path'] = result['file_path']
-                    qa['metadata'] = result['metadata']
-                analysis_results['qa_pairs'].extend(qa_pairs)
+                analysis_results['qa_pairs'].extend(result['records'])
                 
             elif result['type'] == 'extract_concepts':
-                concepts = self._parse_concepts(result['content'])
-                for concept in concepts:
-                    concept['file_path'] = result['file_path']
-                    concept['metadata'] = result['metadata']
-                analysis_results['technical_concepts'].extend(concepts)
+                analysis_results['technical_concepts'].extend(result['records'])
                 
         except Exception as e:
             self.logger.error(f"Error processing analysis result: {e}")
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def _analyze_file(
         self,
         file_info: Dict[str, Any],
         analysis_type: str
     ) -> Dict[str, Any]:
-        """Analyze a single file for specific content type."""
+        """Analyze a single file for specific content type, reusing earlier analyses of the same content."""
+        file_path = file_info.get('path', 'unknown')
+        key = self._content_key(file_info, analysis_type)
+        entry = self._analysis_locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
         try:
-            file_path = file_info.get('path', 'unknown')
-            self.logger.info(f"Analyzing {file_path} for {analysis_type}")
+            # Concurrent requests for the same content wait for one analysis
+            async with entry[0]:
+                content = self._get_cached_analysis(key)
+                if content is None:
+                    content = await self._request_analysis(file_info, analysis_type)
+                    self._store_analysis(key, content)
+                else:
+                    self.logger.info(f"Reusing cached {analysis_type} analysis for {file_path}")
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._analysis_locks[key]
+        
+        return self._build_result(file_path, analysis_type, content)
+
+    async def _request_analysis(
+        self,
+        file_info: Dict[str, Any],
+        analysis_type: str
+    ) -> str:
+        """Request one analysis of a file from the API.
+
+        Large files are analyzed window by window; the windows' Q&A pairs and
+        concepts are concatenated, and their summaries merged by one more request.
+        """
+        file_path = file_info.get('path', 'unknown')
+        self.logger.info(f"Analyzing {file_path} for {analysis_type}")
+        chunks = self._split_content(self._file_content(file_info))
+        if len(chunks) == 1:
+            return await self._complete(file_path, analysis_type, self._build_request(file_path, analysis_type, chunks[0]))
+        
+        self.logger.info(f"Analyzing {file_path} for {analysis_type} in {len(chunks)} windows")
+        partials = await asyncio.gather(*[
+            self._complete(file_path, analysis_type, self._build_request(file_path, analysis_type, chunk))
+            for chunk in chunks
+        ])
+        if analysis_type != 'summarize':
+            return '\n\n'.join(partials)
+        return await self._complete(file_path, analysis_type, self._build_merge_request(file_path, partials))
+
+    async def _complete(self, file_path: str, analysis_type: str, request: Dict[str, Any]) -> str:
+        """Send one chat completion request, paced by the concurrency cap and rate limits."""
+        try:
+            tokens = sum(self._count_tokens(m['content']) for m in request['messages']) + request['max_tokens']
             
-            prompt = self.prompts[analysis_type]
-            file_content = file_info.get('content', '')
+            async with self._get_semaphore():
+                await self._rate_limiter.acquire(tokens)
+                raw = await self.client.chat.completions.with_raw_response.create(**request)
+            self._rate_limiter.update(raw.headers)
+            response = raw.parse()
             
-            # Add file path and type to prompt
-            full_prompt = f"""File: {file_path}
+            return response.choices[0].message.content
+            
+        except Exception as e:
+            self.logger.error(f"Error analyzing file {file_path} for {analysis_type}: {e}")
+            raise
+
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens with tiktoken, or estimate them at ~4 characters per token."""
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return len(text) // 4
+
+    def _file_content(self, file_info: Dict[str, Any]) -> str:
+        """The content to analyze for a file, as text."""
+        content = file_info.get('content', '')
+        return content if isinstance(content, str) else str(content)
+
+    def _split_content(self, content: str) -> List[str]:
+        """Split content above CHUNK_THRESHOLD_TOKENS into line-aligned windows of at most CHUNK_TOKENS.
+
+        A single line longer than a window becomes a window of its own.
+        """
+        if self._count_tokens(content) <= CHUNK_THRESHOLD_TOKENS:
+            return [content]
+        chunks = []
+        window = []
+        window_tokens = 0
+        for line in content.splitlines(keepends=True):
+            line_tokens = self._count_tokens(line)
+            if window and window_tokens + line_tokens > CHUNK_TOKENS:
+                chunks.append(''.join(window))
+                window = []
+                window_tokens = 0
+            window.append(line)
+            window_tokens += line_tokens
+        if window:
+            chunks.append(''.join(window))
+        return chunks
+
+    def _content_key(self, file_info: Dict[str, Any], analysis_type: str) -> Tuple[str, str]:
+        """Cache key for an analysis: a BLAKE2b digest of the file content plus the analysis type."""
+        content = file_info.get('content', '')
+        if not isinstance(content, str):
+            content = json.dumps(content, sort_keys=True, default=str)
+        digest = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+        return digest, analysis_type
+
+    def _get_cached_analysis(self, key: Tuple[str, str]) -> Optional[str]:
+        """Return a cached analysis, marking it as recently used."""
+        content = self._content_cache.get(key)
+        if content is not None:
+            self._content_cache.move_to_end(key)
+        return content
+
+    def _store_analysis(self, key: Tuple[str, str], content: str) -> None:
+        """Cache an analysis, evicting the least recently used beyond ANALYSIS_CACHE_SIZE."""
+        if not content:
+            return
+        self._content_cache[key] = content
+        self._content_cache.move_to_end(key)
+        self._unsaved_entries.append(self._cache_entry(key, content))
+        while len(self._content_cache) > ANALYSIS_CACHE_SIZE:
+            self._content_cache.popitem(last=False)
+
+    def _cache_entry(self, key: Tuple[str, str], content: str) -> bytes:
+        """One line of the analysis cache file."""
+        digest, analysis_type = key
+        return orjson.dumps(
+            {'hash': digest, 'type': analysis_type, 'content': content},
+            option=orjson.OPT_APPEND_NEWLINE
+        )
+
+    def _load_content_cache(self) -> OrderedDict:
+        """Load analyses saved by earlier runs; later lines supersede earlier ones."""
+        cache = OrderedDict()
+        if self.cache_path is None or not self.cache_path.exists():
+            return cache
+        try:
+            with open(self.cache_path, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        entry = orjson.loads(line)
+                        key = (entry['hash'], entry['type'])
+                        cache[key] = entry['content']
+                        cache.move_to_end(key)
+                        self._cache_file_lines += 1
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable analysis cache {self.cache_path}: {e}")
+            self._cache_file_lines = 0
+            return OrderedDict()
+        while len(cache) > ANALYSIS_CACHE_SIZE:
+            cache.popitem(last=False)
+        return cache
+
+    def _save_content_cache(self) -> None:
+        """Append new analyses to the cache file, compacting it when it has grown stale."""
+        if self.cache_path is None or not self._unsaved_entries:
+            return
+        try:
+            if self._cache_file_lines + len(self._unsaved_entries) > 2 * len(self._content_cache):
+                # Rewrite with only the live entries, least recently used first
+                tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+                with open(tmp_path, 'wb') as f:
+                    f.writelines(
+                        self._cache_entry(key, content) for key, content in self._content_cache.items()
+                    )
+                os.replace(tmp_path, self.cache_path)
+                self._cache_file_lines = len(self._content_cache)
+            else:
+                with open(self.cache_path, 'ab') as f:
+                    f.writelines(self._unsaved_entries)
+                self._cache_file_lines += len(self._unsaved_entries)
+            self._unsaved_entries = []
+        except Exception as e:
+            self.logger.error(f"Error saving analysis cache: {e}")
+
+    def _build_request(self, file_path: str, analysis_type: str, file_content: str) -> Dict[str, Any]:
+        """Build the chat completion arguments for one file analysis."""
+        prompt = self.prompts[analysis_type]
+        
+        # Add file path and type to prompt
+        full_prompt = f"""File: {file_path}
             
             {prompt}
             
@@ -159,66 +500,83 @@ class ContentAnalyzer:
             ```python
             {file_content}
             ```"""
+        
+        return self._chat_request(full_prompt)
+
+    def _build_merge_request(self, file_path: str, summaries: List[str]) -> Dict[str, Any]:
+        """Build the request that merges the summaries of a large file's windows."""
+        sections = '\n\n'.join(
+            f"Section {idx}:\n{summary}" for idx, summary in enumerate(summaries, 1)
+        )
+        return self._chat_request(f"""File: {file_path}
             
-            response = await self.client.chat.completions.create(
-                model="gpt-4o-mini-2024-07-18",
-                messages=[
-                    {"role": "system", "content": "You are a technical analyst specializing in Python codebases."},
-                    {"role": "user", "content": full_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
-            
-            return {
-                'file_path': file_path,
-                'type': analysis_type,
-                'content': response.choices[0].message.content,
-                'metadata': {
-                    'file_path': file_path,
-                    'analysis_type': analysis_type,
-                    'timestamp': str(datetime.now())
-                }
-            }
+            {self.merge_prompt}
             
-        except Exception as e:
-            self.logger.error(f"Error analyzing file {file_info.get('path')} for {analysis_type}: {e}")
-            raise
+            {sections}""")
+
+    def _chat_request(self, prompt: str) -> Dict[str, Any]:
+        """Chat completion arguments, with the completion cap fitted to the room left by the prompt."""
+        system_prompt = "You are a technical analyst specializing in Python codebases."
+        prompt_tokens = self._count_tokens(system_prompt) + self._count_tokens(prompt)
+        max_tokens = min(MAX_COMPLETION_TOKENS, MODEL_CONTEXT_TOKENS - prompt_tokens - CONTEXT_MARGIN_TOKENS)
+        return {
+            'model': ANALYSIS_MODEL,
+            'messages': [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.7,
+            'max_tokens': max(1, max_tokens)
+        }
+
+    def _build_result(self, file_path: str, analysis_type: str, content: str) -> Dict[str, Any]:
+        """Wrap a completed analysis for _process_analysis_result.
+
+        Q&A pairs and concepts are parsed into ``records`` here, as each
+        analysis arrives, rather than after every request has finished.
+        """
+        metadata = {
+            'file_path': file_path,
+            'analysis_type': analysis_type,
+            'timestamp': str(datetime.now())
+        }
+        records = []
+        if content and analysis_type == 'generate_qa':
+            records = self._parse_qa_pairs(content)
+        elif content and analysis_type == 'extract_concepts':
+            records = self._parse_concepts(content)
+        for record in records:
+            record['file_path'] = file_path
+            record['metadata'] = metadata
+        return {
+            'file_path': file_path,
+            'type': analysis_type,
+            'content': content,
+            'metadata': metadata,
+            'records': records
+        }
+
+    def _normalize_lines(self, content: str) -> str:
+        """Strip every line and drop blank lines."""
+        return '\n'.join(filter(None, map(str.strip, content.split('\n'))))
 
     def _parse_qa_pairs(self, content: str) -> List[Dict[str, str]]:
-        """Parse Q&A pairs from generated content."""
+        """Parse Q&A pairs from generated content.
+
+        A question's answer starts at its last 'A:' line; without one, the
+        lines following the question are taken as the answer.
+        """
         qa_pairs = []
-        current_question = None
-        current_answer = []
-        
         try:
-            for line in content.split('\n'):
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                if line.startswith('Q:'):
-                    if current_question and current_answer:
-                        qa_pairs.append({
-                            'question': current_question,
-                            'answer': '\n'.join(current_answer).strip()
-                        })
-                    current_question = line[2:].strip()
-                    current_answer = []
-                elif line.startswith('A:'):
-                    current_answer = [line[2:].strip()]
-                elif current_answer is not None:
-                    current_answer.append(line)
-            
-            # Add last QA pair
-            if current_question and current_answer:
-                qa_pairs.append({
-                    'question': current_question,
-                    'answer': '\n'.join(current_answer).strip()
-                })
-            
+            # Text before the first question is ignored
+            for block in _QUESTION_RE.split(self._normalize_lines(content))[1:]:
+                question, _, rest = block.partition('\n')
+                question = question.strip()
+                answer_start = ('\n' + rest).rfind('\nA:')
+                answer = rest[answer_start + 2:] if answer_start >= 0 else rest
+                if question and (answer_start >= 0 or rest):
+                    qa_pairs.append({'question': question, 'answer': answer.strip()})
             return qa_pairs
-            
         except Exception as e:
             self.logger.error(f"Error parsing QA pairs: {e}")
             return []
@@ -226,35 +584,14 @@ class ContentAnalyzer:
     def _parse_concepts(self, content: str) -> List[Dict[str, str]]:
         """Parse technical concepts from generated content."""
         concepts = []
-        current_concept = None
-        current_description = []
-        
         try:
-            for line in content.split('\n'):
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                if line.startswith('##'):
-                    if current_concept and current_description:
-                        concepts.append({
-                            'name': current_concept,
-                            'description': '\n'.join(current_description).strip()
-                        })
-                    current_concept = line[2:].strip()
-                    current_description = []
-                elif current_concept is not None:
-                    current_description.append(line)
-            
-            # Add last concept
-            if current_concept and current_description:
-                concepts.append({
-                    'name': current_concept,
-                    'description': '\n'.join(current_description).strip()
-                })
-            
+            # Text before the first concept heading is ignored
+            for block in _CONCEPT_RE.split(self._normalize_lines(content))[1:]:
+                name, _, description = block.partition('\n')
+                name = name.strip()
+                if name and description:
+                    concepts.append({'name': name, 'description': description.strip()})
             return concepts
-            
         except Exception as e:
             self.logger.error(f"Error parsing concepts: {e}")
-            return []
\ No newline at end of file
+            return []
@@ -1,18 +1,30 @@
 # Copy this content into src/data_ingestion/extractors/api_extractor.py
 from pathlib import Path
 import ast
-from typing import List, Dict
+from typing import List, Dict, Optional
 import logging
 
 class APIExtractor:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def extract_apis(self, file_path: Path) -> List[Dict]:
-        """Extract API-like functions and methods from a Python file."""
+    def extract_apis(
+        self,
+        file_path: Path,
+        content: Optional[str] = None,
+        tree: Optional[ast.Module] = None
+    ) -> List[Dict]:
+        """Extract API-like functions and methods from a Python file.
+
+        ``content`` and ``tree`` are the file's text and AST if the caller
+        has already read or parsed it.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                tree = ast.parse(f.read())
+            if tree is None:
+                if content is None:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                tree = ast.parse(content)
 
             apis = []
             for node in ast.walk(tree):
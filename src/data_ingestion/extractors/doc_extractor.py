@@ -1,10 +1,12 @@
 # src/data_ingestion/extractors/doc_extractor.py
-import re
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import ast
+import io
 import logging
 import json
+import tokenize
+from collections import deque
 
 class DocExtractor:
     def __init__(self):
@@ -12,11 +14,18 @@ class DocExtractor:
         self.markdown_extensions = ['.md', '.rst', '.txt']
         self.code_extensions = ['.py']
 
-    def extract_documentation(self, file_path: Path) -> Dict[str, Any]:
+    def extract_documentation(
+        self,
+        file_path: Path,
+        content: Optional[str] = None,
+        tree: Optional[ast.Module] = None
+    ) -> Dict[str, Any]:
         """Extract documentation from a file.
         
         Args:
             file_path: Path to the file to extract documentation from
+            content: The file's text, if already read; otherwise it is read from disk
+            tree: The AST of ``content`` for Python files, if already parsed
             
         Returns:
             Dictionary containing the extracted documentation
@@ -26,9 +35,9 @@ class DocExtractor:
                 file_path = Path(file_path)
                 
             if file_path.suffix in self.markdown_extensions:
-                return self._extract_markdown_doc(file_path)
+                return self._extract_markdown_doc(file_path, content)
             elif file_path.suffix in self.code_extensions:
-                return self._extract_code_doc(file_path)
+                return self._extract_code_doc(file_path, content, tree)
             else:
                 self.logger.warning(f"Unsupported file type: {file_path.suffix}")
                 return {}
@@ -37,18 +46,22 @@ class DocExtractor:
             self.logger.error(f"Error extracting documentation from {file_path}: {e}")
             return {}
 
-    def _extract_code_doc(self, file_path: Path) -> Dict[str, Any]:
+    def _extract_code_doc(
+        self,
+        file_path: Path,
+        content: Optional[str] = None,
+        tree: Optional[ast.Module] = None
+    ) -> Dict[str, Any]:
         """Extract documentation from Python code file."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if content is None:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            if tree is None:
                 tree = ast.parse(content)
 
-            # Get all class definitions in the file
-            class_nodes = {
-                node: None for node in ast.walk(tree) 
-                if isinstance(node, ast.ClassDef)
-            }
+            class_nodes, function_nodes = self._collect_definitions(tree)
+            inline_comments, todos = self._extract_comments_and_todos(content)
 
             # Extract documentation
             doc_info = {
@@ -71,13 +84,10 @@ class DocExtractor:
                             'args': [arg.arg for arg in node.args.args],
                             'returns': self._get_return_type(node)
                         }
-                        for node in ast.walk(tree)
-                        if isinstance(node, ast.FunctionDef) 
-                        and not any(node in ast.walk(class_def) 
-                                  for class_def in class_nodes)
+                        for node in function_nodes
                     ],
-                    'inline_comments': self._extract_inline_comments(content),
-                    'todos': self._extract_todos(content)
+                    'inline_comments': inline_comments,
+                    'todos': todos
                 }),
                 'metadata': {
                     'file_name': file_path.name,
@@ -90,6 +100,24 @@ class DocExtractor:
             self.logger.error(f"Error extracting code documentation: {e}")
             return {}
 
+    def _collect_definitions(self, tree: ast.AST):
+        """Find all classes, and the functions not nested in any class, in one walk.
+
+        Nodes are visited breadth-first, in the same order as ``ast.walk``.
+        """
+        class_nodes = []
+        function_nodes = []
+        todo = deque([(tree, False)])
+        while todo:
+            node, in_class = todo.popleft()
+            if isinstance(node, ast.ClassDef):
+                class_nodes.append(node)
+                in_class = True
+            elif isinstance(node, ast.FunctionDef) and not in_class:
+                function_nodes.append(node)
+            todo.extend((child, in_class) for child in ast.iter_child_nodes(node))
+        return class_nodes, function_nodes
+
     def _format_content(self, content_dict: Dict[str, Any]) -> str:
         """Format the documentation content into a single string."""
         sections = []
@@ -145,27 +173,37 @@ class DocExtractor:
                 pass
         return ''
 
-    def _extract_inline_comments(self, content: str) -> List[Dict[str, Any]]:
-        """Extract inline comments from code."""
-        return [
-            {'line': i + 1, 'content': m.group(1).strip()}
-            for i, line in enumerate(content.splitlines())
-            if (m := re.match(r'.*#\s*(.+)$', line))
-        ]
+    def _extract_comments_and_todos(self, content: str):
+        """Extract inline comments and TODO comments from the comment tokens.
 
-    def _extract_todos(self, content: str) -> List[Dict[str, Any]]:
-        """Extract TODO comments."""
-        return [
-            {'line': i + 1, 'content': line.split('TODO:', 1)[1].strip()}
-            for i, line in enumerate(content.splitlines())
-            if 'TODO:' in line
-        ]
+        Tokenizing skips ``#`` characters inside string literals, which a
+        line-based pattern would mistake for comments.
+        """
+        inline_comments = []
+        todos = []
+        if '#' not in content:
+            return inline_comments, todos
+        try:
+            for token in tokenize.generate_tokens(io.StringIO(content).readline):
+                if token.type != tokenize.COMMENT:
+                    continue
+                text = token.string[1:].strip()
+                if not text:
+                    continue
+                line = token.start[0]
+                inline_comments.append({'line': line, 'content': text})
+                if 'TODO:' in text:
+                    todos.append({'line': line, 'content': text.split('TODO:', 1)[1].strip()})
+        except (tokenize.TokenError, SyntaxError) as e:
+            self.logger.error(f"Error extracting comments: {e}")
+        return inline_comments, todos
 
-    def _extract_markdown_doc(self, file_path: Path) -> Dict[str, Any]:
+    def _extract_markdown_doc(self, file_path: Path, content: Optional[str] = None) -> Dict[str, Any]:
         """Extract documentation from markdown files."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if content is None:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
                 
             return {
                 'file_path': str(file_path),
@@ -1,8 +1,9 @@
 # Copy this content into src/data_ingestion/extractors/env_extractor.py
 import re
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 import logging
+from ..text_index import TextIndex
 
 class EnvExtractor:
     def __init__(self):
@@ -14,30 +15,47 @@ class EnvExtractor:
             r'ENV\[["\']([^"\']+)["\']',
             r'load_dotenv\(["\']([^"\']+)["\']'
         ]
+        # One alternation scans the file once; each pattern keeps its own group
+        self._env_re = re.compile('|'.join(f'(?:{p})' for p in self.env_patterns))
+        # Every pattern contains one of these, so files without them can't match
+        self._env_markers = ('env', 'ENV')
 
-    def extract_env_vars(self, file_path: Path) -> List[Dict]:
-        """Extract environment variables from a Python file."""
+    def extract_env_vars(
+        self,
+        file_path: Path,
+        content: Optional[str] = None,
+        index: Optional[TextIndex] = None
+    ) -> List[Dict]:
+        """Extract environment variables from a Python file.
+
+        ``content`` and ``index`` are the file's text and line index if the
+        caller has already built them.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if content is None:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
 
             env_vars = []
-            line_number = 0
             
-            for line in content.split('\n'):
-                line_number += 1
-                for pattern in self.env_patterns:
-                    matches = re.finditer(pattern, line)
-                    for match in matches:
-                        env_var = match.group(1)
-                        env_vars.append({
-                            'name': env_var,
-                            'line_number': line_number,
-                            'context': self._get_context(content, line_number),
-                            'file_path': str(file_path),
-                            'is_required': self._is_required(line),
-                            'default_value': self._extract_default_value(line)
-                        })
+            # Substring search is far cheaper than running the regex over the file
+            if any(marker in content for marker in self._env_markers):
+                matches = self._env_re.finditer(content)
+            else:
+                matches = ()
+            for match in matches:
+                if index is None:
+                    index = TextIndex(content)
+                line_number = index.line_of(match.start())
+                line = index.line(line_number)
+                env_vars.append({
+                    'name': match.group(match.lastindex),
+                    'line_number': line_number,
+                    'context': self._get_context(index, line_number),
+                    'file_path': str(file_path),
+                    'is_required': self._is_required(line),
+                    'default_value': self._extract_default_value(line)
+                })
 
             # Also check for .env file references
             self._extract_env_file_vars(file_path, env_vars)
@@ -47,14 +65,9 @@ class EnvExtractor:
             self.logger.error(f"Error extracting env vars from {file_path}: {e}")
             return []
 
-    def _get_context(self, content: str, line_number: int, context_lines: int = 2) -> str:
-        """Get surrounding context for an environment variable usage."""
-        lines = content.split('\n')
-        start = max(0, line_number - context_lines - 1)
-        end = min(len(lines), line_number + context_lines)
-        
-        context_lines = lines[start:end]
-        return '\n'.join(context_lines)
+    def _get_context(self, index: TextIndex, line_number: int, context_lines: int = 2) -> str:
+        """Get surrounding context for an environment variable usage from the file's line index."""
+        return index.window(line_number, context_lines)
 
     def _is_required(self, line: str) -> bool:
         """Determine if the environment variable is required."""
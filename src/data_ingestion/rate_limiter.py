@@ -0,0 +1,73 @@
+# src/data_ingestion/rate_limiter.py
+
+from typing import Mapping, Optional
+import asyncio
+import time
+
+# OpenAI request and token limits are per minute
+_LIMIT_WINDOW = 60.0
+
+
+class TokenBucket:
+    """Client-side pacing for OpenAI request and token rate limits.
+
+    Starts unthrottled. Once ``update`` has seen the ``x-ratelimit-*``
+    response headers, ``acquire`` waits until both the request and token
+    budgets, which refill continuously at the reported per-minute limits,
+    cover the next call.
+    """
+
+    def __init__(self):
+        self._request_limit: Optional[float] = None
+        self._token_limit: Optional[float] = None
+        self._requests = 0.0
+        self._tokens = 0.0
+        self._refilled_at = time.monotonic()
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until a request of roughly ``tokens`` tokens fits the budget, then spend it."""
+        while True:
+            self._refill()
+            wait = 0.0
+            if self._request_limit and self._requests < 1:
+                wait = (1 - self._requests) * _LIMIT_WINDOW / self._request_limit
+            if self._token_limit:
+                # A request larger than the whole budget only waits for a full bucket
+                needed = min(tokens, self._token_limit)
+                if self._tokens < needed:
+                    wait = max(wait, (needed - self._tokens) * _LIMIT_WINDOW / self._token_limit)
+            if wait <= 0:
+                self._requests -= 1
+                self._tokens -= tokens
+                return
+            await asyncio.sleep(wait)
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Adopt the limits and remaining budgets reported by the API."""
+        self._refill()
+        self._request_limit, self._requests = self._apply(
+            headers, 'requests', self._request_limit, self._requests
+        )
+        self._token_limit, self._tokens = self._apply(
+            headers, 'tokens', self._token_limit, self._tokens
+        )
+
+    def _apply(self, headers: Mapping[str, str], kind: str, limit: Optional[float], available: float):
+        """Return the updated ``(limit, available)`` pair for one kind of budget."""
+        try:
+            new_limit = float(headers[f'x-ratelimit-limit-{kind}'])
+            remaining = float(headers[f'x-ratelimit-remaining-{kind}'])
+        except (KeyError, TypeError, ValueError):
+            return limit, available
+        # The server's count can't include requests still in flight, so keep the lower figure
+        return new_limit, remaining if limit is None else min(available, remaining)
+
+    def _refill(self) -> None:
+        """Add the budget accrued since the last refill."""
+        now = time.monotonic()
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        if self._request_limit:
+            self._requests = min(self._request_limit, self._requests + elapsed * self._request_limit / _LIMIT_WINDOW)
+        if self._token_limit:
+            self._tokens = min(self._token_limit, self._tokens + elapsed * self._token_limit / _LIMIT_WINDOW)
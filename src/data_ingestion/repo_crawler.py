@@ -19,7 +19,10 @@ class RepoCrawler:
             if not self.local_path.exists():
                 self.logger.info(f"Cloning repository from {self.repo_url}")
                 self.local_path.parent.mkdir(parents=True, exist_ok=True)
-                return git.Repo.clone_from(self.repo_url, str(self.local_path))
+                # Only the current tree is crawled, so history isn't needed
+                return git.Repo.clone_from(
+                    self.repo_url, str(self.local_path), depth=1, single_branch=True
+                )
             else:
                 self.logger.info("Repository already exists locally")
                 return git.Repo(str(self.local_path))
@@ -34,9 +37,11 @@ class RepoCrawler:
         """Update the local repository to the latest version."""
         try:
             repo = git.Repo(str(self.local_path))
-            current = repo.head.commit
-            repo.remotes.origin.pull()
-            if current != repo.head.commit:
+            # Fetch just the new tip and move to it; the checkout is never edited locally
+            repo.git.fetch('--depth=1', 'origin')
+            latest = repo.commit('FETCH_HEAD')
+            if repo.head.commit != latest:
+                repo.git.reset('--hard', latest.hexsha)
                 self.logger.info("Repository updated successfully")
                 return True
             self.logger.info("Repository already up to date")
@@ -46,19 +51,22 @@ class RepoCrawler:
             return False
 
     def get_file_list(self, file_types: Optional[List[str]] = None) -> List[str]:
-        """Get list of files in the repository."""
+        """Get list of files in the repository, skipping hidden files and directories."""
         if file_types is None:
-            file_types = ['.py''.md', '.txt']
+            file_types = ['.py', '.md', '.txt']
             
         try:
+            extensions = frozenset(file_types)
             files = []
-            for file_type in file_types:
-                files.extend(
-                    str(f.relative_to(self.local_path))
-                    for f in self.local_path.rglob(f"*{file_type}")
-                    if not any(part.startswith('.') for part in f.parts)
-                )
+            # A single walk that never descends into hidden directories such as .git
+            for root, dirs, filenames in os.walk(self.local_path):
+                dirs[:] = [d for d in dirs if not d.startswith('.')]
+                rel_root = os.path.relpath(root, self.local_path)
+                for filename in filenames:
+                    if filename.startswith('.') or os.path.splitext(filename)[1] not in extensions:
+                        continue
+                    files.append(filename if rel_root == '.' else os.path.join(rel_root, filename))
             return files
         except Exception as e:
             self.logger.error(f"Error getting file list: {e}")
-            return []
\ No newline at end of file
+            return []
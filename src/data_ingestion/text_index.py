@@ -0,0 +1,52 @@
+# src/data_ingestion/text_index.py
+
+from array import array
+from bisect import bisect_right
+
+
+class TextIndex:
+    """Line lookups over a source string without splitting it into lines.
+
+    Lines are separated by ``'\\n'`` and numbered from 1, matching AST and
+    tokenizer line numbers. Line start offsets are kept in a compact array,
+    and lines are sliced from the source on demand.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        starts = array('q', [0])
+        pos = source.find('\n')
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = source.find('\n', pos + 1)
+        # Sentinel: one past the end, as if the text ended with a newline
+        starts.append(len(source) + 1)
+        self._starts = starts
+
+    @property
+    def line_count(self) -> int:
+        return len(self._starts) - 1
+
+    def line_of(self, offset: int) -> int:
+        """Number of the line containing the character at ``offset``."""
+        return bisect_right(self._starts, offset)
+
+    def line(self, line_number: int) -> str:
+        """Text of one line, without its newline."""
+        return self.source[self._starts[line_number - 1]:self._starts[line_number] - 1]
+
+    def span(self, first: int, last: int) -> str:
+        """Text of lines ``first`` to ``last`` inclusive, with their newlines."""
+        first = max(1, first)
+        last = min(self.line_count, last)
+        if first > last:
+            return ''
+        return self.source[self._starts[first - 1]:self._starts[last]]
+
+    def window(self, line_number: int, context_lines: int) -> str:
+        """Lines within ``context_lines`` of ``line_number``, joined by newlines."""
+        first = max(1, line_number - context_lines)
+        last = min(self.line_count, line_number + context_lines)
+        if first > last:
+            return ''
+        return self.source[self._starts[first - 1]:self._starts[last] - 1]
@@ -11,10 +11,11 @@ import os
 class TextProcessor:
     """Process markdown and text files separately from main code processing."""
     
-    def __init__(self, repo_path: str, persist_directory: str):
+    def __init__(self, repo_path: str, persist_directory: str, batch_size: int = 200):
         self.logger = logging.getLogger(__name__)
         self.repo_path = Path(repo_path)
         self.persist_directory = persist_directory
+        self.batch_size = max(1, batch_size)
         
         # Initialize ChromaDB client
         self.client = chromadb.PersistentClient(path=persist_directory)
@@ -129,11 +130,12 @@ class TextProcessor:
             return {}
 
     def _store_in_chroma(self, documents: List[Dict[str, Any]]) -> bool:
-        """Store processed documents in ChromaDB."""
+        """Store processed documents in ChromaDB in batches of ``batch_size``."""
         try:
             docs = []
             metadatas = []
             ids = []
+            stored = 0
             
             for idx, doc in enumerate(documents):
                 # Store full document
@@ -156,17 +158,34 @@ class TextProcessor:
                             'file_name': doc['metadata']['file_name']
                         })
                         ids.append(f"doc_{idx}_section_{section_idx}")
+                
+                # Flush full batches to keep each request to ChromaDB bounded
+                while len(docs) >= self.batch_size:
+                    self._add_batch(
+                        docs[:self.batch_size],
+                        metadatas[:self.batch_size],
+                        ids[:self.batch_size]
+                    )
+                    stored += self.batch_size
+                    del docs[:self.batch_size], metadatas[:self.batch_size], ids[:self.batch_size]
             
             if docs:
-                self.doc_collection.add(
-                    documents=docs,
-                    metadatas=metadatas,
-                    ids=ids
-                )
-                self.logger.info(f"Stored {len(docs)} documents and sections in ChromaDB")
+                self._add_batch(docs, metadatas, ids)
+                stored += len(docs)
+            
+            if stored:
+                self.logger.info(f"Stored {stored} documents and sections in ChromaDB")
             
             return True
             
         except Exception as e:
             self.logger.error(f"Error storing in ChromaDB: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    def _add_batch(self, docs: List[str], metadatas: List[Dict[str, Any]], ids: List[str]) -> None:
+        """Add a single batch of documents to the documentation collection."""
+        self.doc_collection.add(
+            documents=docs,
+            metadatas=metadatas,
+            ids=ids
+        )
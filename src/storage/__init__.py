@@ -14,7 +14,8 @@ class StorageManager:
         self,
         persist_directory: str,
         metadata_db_path: str,
-        preserve_data: bool = True
+        preserve_data: bool = True,
+        hnsw_config: Optional[Dict[str, Any]] = None
     ):
         self.logger = logging.getLogger(__name__)
         
@@ -24,7 +25,7 @@ class StorageManager:
             Path(metadata_db_path).parent.mkdir(parents=True, exist_ok=True)
             
             # Initialize core components
-            self.vector_store = VectorStore(persist_directory)
+            self.vector_store = VectorStore(persist_directory, hnsw_config=hnsw_config)
             self.metadata_store = MetadataStore(metadata_db_path, preserve_data=preserve_data)
             
             self.logger.info("Storage manager initialized successfully")
@@ -82,33 +83,39 @@ class StorageManager:
 
     def search(self, query: str, search_type: str = 'all') -> Dict[str, Any]:
         """Search for information across all storage systems."""
+        return self.search_batch([query], search_type)[0]
+
+    def search_batch(self, queries: List[str], search_type: str = 'all') -> List[Dict[str, Any]]:
+        """Search several queries at once, returning one result dict per query."""
         try:
-            results = {}
+            batch_results = [{} for _ in queries]
+            if not queries:
+                return batch_results
             
             # Search vector store
             if search_type in ['all', 'code']:
-                code_results = self.vector_store.search(query, 'code')
-                if code_results:
-                    results['code_snippets'] = code_results
-                    self.logger.info(f"Found {len(code_results)} code results")
+                for results, code_results in zip(batch_results, self.vector_store.search_batch(queries, 'code')):
+                    if code_results:
+                        results['code_snippets'] = code_results
+                        self.logger.info(f"Found {len(code_results)} code results")
             
             if search_type in ['all', 'documentation']:
-                doc_results = self.vector_store.search(query, 'documentation')
-                if doc_results:
-                    results['documentation'] = doc_results
-                    self.logger.info(f"Found {len(doc_results)} documentation results")
+                for results, doc_results in zip(batch_results, self.vector_store.search_batch(queries, 'documentation')):
+                    if doc_results:
+                        results['documentation'] = doc_results
+                        self.logger.info(f"Found {len(doc_results)} documentation results")
             
             # Search metadata store
             if search_type in ['all', 'metadata']:
-                metadata_results = self.metadata_store.search_metadata(query)
-                if metadata_results:
-                    results['metadata'] = metadata_results
-                    self.logger.info(f"Found metadata results")
+                for results, metadata_results in zip(batch_results, self.metadata_store.search_metadata_batch(queries)):
+                    if metadata_results:
+                        results['metadata'] = metadata_results
+                        self.logger.info(f"Found metadata results")
             
-            return results
+            return batch_results
         except Exception as e:
             self.logger.error(f"Error searching: {e}")
-            return {}
+            return [{} for _ in queries]
 
     def get_repository_info(self) -> Dict[str, Any]:
         """Get comprehensive repository information."""
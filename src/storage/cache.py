@@ -1,6 +1,6 @@
 # src/storage/cache.py
 import redis
-import json
+import orjson
 from typing import Optional, Any, Dict, Union
 #from typing import Optional, Any, Dict, Union
 import logging
@@ -26,7 +26,7 @@ class ResponseCache:
             cached_response = self.redis_client.get(key)
             
             if cached_response:
-                return json.loads(cached_response)
+                return orjson.loads(cached_response)
             return None
         except Exception as e:
             self.logger.error(f"Error retrieving from cache: {e}")
@@ -44,7 +44,7 @@ class ResponseCache:
             self.redis_client.setex(
                 key,
                 ttl or self.default_ttl,
-                json.dumps(response)
+                orjson.dumps(response, option=orjson.OPT_NON_STR_KEYS)
             )
         except Exception as e:
             self.logger.error(f"Error storing in cache: {e}")
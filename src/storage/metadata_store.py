@@ -104,7 +104,7 @@ class MetadataStore:
             if 'files' in data:
                 for file in data['files']:
                     if file.get('path', '').endswith('setup.py'):
-                        setup_info['setup_file'] = file
+                        setup_info['setup_file'] = self._with_setup_source(file)
                         break
             
             if 'repo_info' in data and 'stats' in data['repo_info']:
@@ -115,6 +115,20 @@ class MetadataStore:
             self.logger.error(f"Error extracting setup info: {e}")
             return {}
 
+    def _with_setup_source(self, file: Dict[str, Any]) -> Dict[str, Any]:
+        """Attach setup.py's source, which parsed file structures don't carry."""
+        structure = file.get('structure')
+        source_path = structure.get('file_path') if isinstance(structure, dict) else None
+        if not source_path:
+            return file
+        try:
+            with open(source_path, 'r', encoding='utf-8') as f:
+                raw_content = f.read()
+        except OSError as e:
+            self.logger.warning(f"Could not read setup file {source_path}: {e}")
+            return file
+        return {**file, 'structure': {**structure, 'raw_content': raw_content}}
+
     def _store_setup_info(self, setup_info: Dict[str, Any]) -> bool:
         """Store setup-specific information."""
         try:
@@ -263,29 +277,37 @@ class MetadataStore:
 
     def search_metadata(self, query: str) -> Dict[str, Any]:
         """Search through metadata."""
+        return self.search_metadata_batch([query])[0]
+
+    def search_metadata_batch(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """Search through metadata for several queries over a single connection."""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 
-                # Search API metadata
-                cursor.execute("""
-                    SELECT * FROM api_metadata 
-                    WHERE name LIKE ? OR docstring LIKE ?
-                """, (f"%{query}%", f"%{query}%"))
-                api_results = [{k: row[k] for k in row.keys()} for row in cursor.fetchall()]
-                
-                # Search setup info
-                cursor.execute("""
-                    SELECT * FROM setup_info 
-                    WHERE value LIKE ?
-                """, (f"%{query}%",))
-                setup_results = [{k: row[k] for k in row.keys()} for row in cursor.fetchall()]
+                batch_results = []
+                for query in queries:
+                    # Search API metadata
+                    cursor.execute("""
+                        SELECT * FROM api_metadata 
+                        WHERE name LIKE ? OR docstring LIKE ?
+                    """, (f"%{query}%", f"%{query}%"))
+                    api_results = [{k: row[k] for k in row.keys()} for row in cursor.fetchall()]
+                    
+                    # Search setup info
+                    cursor.execute("""
+                        SELECT * FROM setup_info 
+                        WHERE value LIKE ?
+                    """, (f"%{query}%",))
+                    setup_results = [{k: row[k] for k in row.keys()} for row in cursor.fetchall()]
+                    
+                    batch_results.append({
+                        'apis': api_results,
+                        'setup': setup_results
+                    })
                 
-                return {
-                    'apis': api_results,
-                    'setup': setup_results
-                }
+                return batch_results
         except Exception as e:
             self.logger.error(f"Error searching metadata: {e}")
-            return {}
\ No newline at end of file
+            return [{} for _ in queries]
@@ -1,7 +1,7 @@
 # src/storage/vector_store.py
 import chromadb
 from chromadb.utils import embedding_functions
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import logging
 import os
 import json
@@ -9,10 +9,16 @@ from difflib import SequenceMatcher
 
 
 class VectorStore:
-    def __init__(self, persist_directory: str):
+    def __init__(self, persist_directory: str, hnsw_config: Optional[Dict[str, Any]] = None):
         self.logger = logging.getLogger(__name__)
         self.persist_directory = persist_directory
         
+        # HNSW index parameters only take effect when a collection is first created
+        self.hnsw_metadata = {
+            key if key.startswith('hnsw:') else f"hnsw:{key}": value
+            for key, value in (hnsw_config or {}).items()
+        }
+        
         # Initialize ChromaDB client
         self.client = chromadb.PersistentClient(path=persist_directory)
         
@@ -28,20 +34,30 @@ class VectorStore:
             'code': self.client.get_or_create_collection(
                 name="code_snippets",
                 embedding_function=self.embedding_function,
-                metadata={"description": "Code snippets from the repository"}
+                metadata={"description": "Code snippets from the repository", **self.hnsw_metadata}
             ),
             'documentation': self.client.get_or_create_collection(
                 name="documentation",
                 embedding_function=self.embedding_function,
-                metadata={"description": "Documentation content"}
+                metadata={"description": "Documentation content", **self.hnsw_metadata}
             )
         }
 
     def search(self, query: str, search_type: str = 'all') -> List[Dict[str, Any]]:
         """Simplified search with more lenient result inclusion."""
+        return self.search_batch([query], search_type)[0]
+
+    def search_batch(self, queries: List[str], search_type: str = 'all') -> List[List[Dict[str, Any]]]:
+        """Search several queries with one ChromaDB request per collection.
+
+        Returns one result list per query, in the same order as ``queries``.
+        """
         try:
-            results = []
-            seen_contents = set()
+            if not queries:
+                return []
+
+            batch_results = [[] for _ in queries]
+            seen_contents = [set() for _ in queries]
             
             # Determine which collections to search
             collections_to_search = []
@@ -54,54 +70,58 @@ class VectorStore:
                 try:
                     # Get more results initially
                     search_results = collection.query(
-                        query_texts=[query],
+                        query_texts=list(queries),
                         n_results=20,
                         include=['documents', 'metadatas', 'distances']
                     )
                     
-                    if not search_results['documents'][0]:
-                        continue
-                    
-                    # Process each result
-                    for doc, metadata, distance in zip(
-                        search_results['documents'][0],
-                        search_results['metadatas'][0],
-                        search_results['distances'][0]
-                    ):
-                        # Simple deduplication
-                        content_hash = hash(str(doc))
-                        if content_hash in seen_contents:
+                    for idx, results in enumerate(batch_results):
+                        if not search_results['documents'][idx]:
                             continue
                         
-                        # Calculate basic relevance score
-                        relevance_score = 1.0 - min(distance, 1.0)
-                        
-                        # Include result if it has any relevance
-                        if relevance_score > 0:
-                            results.append({
-                                'content': doc,
-                                'metadata': metadata,
-                                'type': coll_type,
-                                'relevance_score': relevance_score
-                            })
-                            seen_contents.add(content_hash)
-                            self.logger.info(f"Found result with score {relevance_score:.2f}")
+                        # Process each result
+                        for doc, metadata, distance in zip(
+                            search_results['documents'][idx],
+                            search_results['metadatas'][idx],
+                            search_results['distances'][idx]
+                        ):
+                            # Simple deduplication
+                            content_hash = hash(str(doc))
+                            if content_hash in seen_contents[idx]:
+                                continue
+                            
+                            # Calculate basic relevance score
+                            relevance_score = 1.0 - min(distance, 1.0)
+                            
+                            # Include result if it has any relevance
+                            if relevance_score > 0:
+                                results.append({
+                                    'content': doc,
+                                    'metadata': metadata,
+                                    'type': coll_type,
+                                    'relevance_score': relevance_score
+                                })
+                                seen_contents[idx].add(content_hash)
+                                self.logger.info(f"Found result with score {relevance_score:.2f}")
                 
                 except Exception as e:
                     self.logger.error(f"Error searching {coll_type}: {e}")
                     continue
             
-            # Sort by relevance score
-            results.sort(key=lambda x: x['relevance_score'], reverse=True)
-            
-            if results:
-                self.logger.info(f"Found {len(results)} results with top score {results[0]['relevance_score']:.2f}")
+            for idx, results in enumerate(batch_results):
+                # Sort by relevance score
+                results.sort(key=lambda x: x['relevance_score'], reverse=True)
+                
+                if results:
+                    self.logger.info(f"Found {len(results)} results with top score {results[0]['relevance_score']:.2f}")
+                
+                batch_results[idx] = results[:15]
             
-            return results[:15]
+            return batch_results
             
         except Exception as e:
             self.logger.error(f"Error in search: {e}")
-            return []
+            return [[] for _ in queries]
 
     def add_code_snippets(self, snippets: List[Dict[str, Any]]) -> bool:
         """Add code snippets to vector store."""
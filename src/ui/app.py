@@ -4,7 +4,6 @@ import asyncio
 import logging
 from typing import Optional, Dict, Any, List
 import os
-from dotenv import load_dotenv
 from src.storage import StorageManager
 from src.ai_processing import AIProcessor
 from src.ui.components.chat import ChatInterface
@@ -54,8 +53,6 @@ class WhisperAssistantUI:
     def _initialize_processor(self) -> AIProcessor:
         """Initialize the AI processor with storage manager."""
         try:
-            load_dotenv()
-            
             # Initialize storage without Redis
             storage = StorageManager(
                 persist_directory='./data/embeddings',
@@ -144,9 +141,19 @@ class WhisperAssistantUI:
                     st.write(f"- {source['file']}")
 
     async def _process_query(self, query: str) -> Dict[str, Any]:
-        """Process a query using the AI processor."""
+        """Process a query using the AI processor, streaming the answer as it arrives."""
         try:
-            return await st.session_state.processor.process_query(query)
+            placeholder = st.empty()
+            answer_parts = []
+            response = {}
+            async for item in st.session_state.processor.process_query_stream(query, debug=True):
+                if item.get('done'):
+                    response = item
+                else:
+                    answer_parts.append(item['delta'])
+                    placeholder.markdown(''.join(answer_parts))
+            placeholder.empty()
+            return response
         except Exception as e:
             self.logger.error(f"Error processing query: {e}")
             return {
@@ -3,7 +3,7 @@ import os
 import streamlit as st
 from pathlib import Path
 import logging
-from dotenv import load_dotenv
+from src import configure_performance_environment
 from src.ui.app import WhisperAssistantUI
 
 # Set page configuration first
@@ -28,8 +28,8 @@ logger = logging.getLogger(__name__)
 def setup_environment():
     """Setup necessary environment and directories."""
     try:
-        # Load environment variables
-        load_dotenv()
+        # Load environment variables (no-op after the first call)
+        configure_performance_environment()
         
         # Create necessary directories
         directories = [